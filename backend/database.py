@@ -0,0 +1,29 @@
+from fastapi import Request
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from dotenv import load_dotenv
+from pathlib import Path
+import os
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# One client per process, shared by the app and every router so they all
+# draw from the same connection pool
+client = AsyncIOMotorClient(
+    os.environ['MONGO_URL'],
+    maxPoolSize=200,
+    minPoolSize=20,
+    waitQueueTimeoutMS=5000,
+    maxIdleTimeMS=300000,
+    # Compress the JSON-heavy simulation documents on the wire; the server
+    # picks the first one it supports (zstd needs MongoDB 4.2+)
+    compressors="zstd,zlib",
+    retryWrites=True,
+    serverSelectionTimeoutMS=3000
+)
+db = client[os.environ['DB_NAME']]
+
+def get_db(request: Request) -> AsyncIOMotorDatabase:
+    """FastAPI dependency returning the app's shared database handle"""
+    return request.app.state.db
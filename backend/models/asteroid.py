@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from bson import ObjectId
@@ -54,12 +54,11 @@ class Asteroid(BaseModel):
     last_updated: datetime = Field(default_factory=datetime.utcnow)
     is_active: bool = True
     
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
+    model_config = ConfigDict(populate_by_name=True)
+    
+    @field_serializer("last_updated", when_used="json")
+    def _serialize_datetime(self, value: datetime) -> str:
+        return value.isoformat()
 
 class AsteroidFilter(BaseModel):
     """Filter parameters for asteroid search"""
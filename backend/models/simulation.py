@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from bson import ObjectId
@@ -28,6 +28,7 @@ class ImpactParameters(BaseModel):
 class ImpactMetric(BaseModel):
     """Individual impact metric with enhanced data"""
     value: str
+    value_numeric: Optional[float] = None  # Unformatted value for aggregations
     unit: str
     severity: str  # catastrophic, severe, moderate, minor
     description: str
@@ -40,7 +41,7 @@ class ImpactResults(BaseModel):
     immediate: Dict[str, ImpactMetric]
     environmental: Dict[str, ImpactMetric]
     human_impact: Dict[str, ImpactMetric]
-    timeline: Dict[str, Dict[str, str]]
+    timeline: Dict[str, Dict[str, str]] = {}  # Omitted from list projections
     
     # Enhanced scientific data
     asteroid_source: str  # "nasa_neo" or "custom"
@@ -73,12 +74,11 @@ class Simulation(BaseModel):
     nasa_enhanced: bool = True  # Uses real NASA data
     peer_reviewed: bool = False  # Future feature
     
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
+    model_config = ConfigDict(populate_by_name=True)
+    
+    @field_serializer("created_at", "updated_at", when_used="json")
+    def _serialize_datetime(self, value: datetime) -> str:
+        return value.isoformat()
 
 class SimulationCreate(BaseModel):
     """Request model for creating new simulation"""
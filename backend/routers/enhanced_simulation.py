@@ -1,45 +1,102 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import logging
-from datetime import datetime
+import multiprocessing
+import os
+from datetime import datetime, timedelta
 from bson import ObjectId
+from bson.errors import InvalidId
+from cachetools import TTLCache
+import orjson
 
-from models.simulation import Simulation, SimulationCreate, SimulationUpdate, ImpactParameters
+from database import get_db
+from models.simulation import Simulation, SimulationCreate, SimulationUpdate, ImpactParameters, ImpactResults
 from models.asteroid import Asteroid
 from services.nasa_neo_service import nasa_neo_service
+from services.neo_cache import asteroids_changed
 from services.physics_engine import physics_engine
+from services.physics_kernels import warm_up as warm_up_physics_kernels
 
 logger = logging.getLogger(__name__)
 
-def get_database():
-    """Get database connection"""
-    from motor.motor_asyncio import AsyncIOMotorClient
-    import os
-    from dotenv import load_dotenv
-    from pathlib import Path
-    
-    # Load environment variables
-    ROOT_DIR = Path(__file__).parent.parent
-    load_dotenv(ROOT_DIR / '.env')
-    
-    mongo_url = os.environ['MONGO_URL']
-    client = AsyncIOMotorClient(mongo_url)
-    return client[os.environ['DB_NAME']]
+# Short-lived cache for the collection-wide statistics aggregation
+STATISTICS_CACHE_KEY = "statistics"
+_statistics_cache = TTLCache(maxsize=8, ttl=30)
+_statistics_cache_lock = asyncio.Lock()
+
+# Physics calculations are CPU-bound, so they run in worker processes to
+# keep the event loop free. Each uvicorn worker gets its own pool, so the
+# size is capped and can be set with PHYSICS_WORKERS. Each worker loads the
+# Numba kernels once when it starts rather than on its first request.
+PHYSICS_WORKERS = int(os.environ.get('PHYSICS_WORKERS', min(os.cpu_count() or 1, 4)))
+physics_pool: Optional[ProcessPoolExecutor] = None
+
+# Largest number of simulations accepted by /run/batch
+MAX_BATCH_SIMULATIONS = 50
+
+# Largest number of scenarios accepted by /batch-scenarios
+MAX_BATCH_SCENARIOS = 1000
 
-# Initialize database connection
-db = get_database()
+# Cached asteroids older than this are refreshed from NASA in the background
+ASTEROID_CACHE_MAX_AGE = timedelta(days=7)
+
+# Fields omitted when listing simulations
+LIST_PROJECTION = {"asteroid_data": 0, "results.timeline": 0}
+
+# Simulations only store the asteroid's NASA ID; these stages join the
+# cached asteroid record back in when a response needs it. Older simulations
+# embed asteroid_data, which is kept when the asteroid isn't cached.
+ASTEROID_LOOKUP_STAGES = [
+    {"$lookup": {
+        "from": "asteroids",
+        "localField": "parameters.asteroid_nasa_id",
+        "foreignField": "nasa_id",
+        "as": "asteroid_lookup"
+    }},
+    {"$addFields": {
+        "asteroid_data": {"$ifNull": [{"$arrayElemAt": ["$asteroid_lookup", 0]}, "$asteroid_data"]}
+    }},
+    {"$project": {"asteroid_lookup": 0, "asteroid_data._id": 0, "asteroid_data.nasa_data": 0}}
+]
+
+# Comparison matrix rows and the result metric each one reads
+COMPARISON_METRICS = {
+    "crater_diameters": ("immediate", "craterDiameter"),
+    "energies": ("immediate", "energy"),
+    "casualties": ("human_impact", "casualtiesImmediate"),
+    "shockwave_radii": ("environmental", "shockwaveRadius")
+}
 
 router = APIRouter(prefix="/api/simulation", tags=["Enhanced Simulation"])
 
-@router.post("/run", response_model=Simulation)
-async def run_enhanced_simulation(simulation_request: SimulationCreate):
+def _oid(sid: str, detail: str = "Invalid simulation ID format") -> ObjectId:
+    """Parse a simulation ID, rejecting malformed ones with a 400"""
+    try:
+        return ObjectId(sid)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail=detail)
+
+def _simulation_oid(simulation_id: str) -> ObjectId:
+    """Path dependency that parses {simulation_id} once per request"""
+    return _oid(simulation_id)
+
+@router.post("/run")
+async def run_enhanced_simulation(
+    simulation_request: SimulationCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
     """Run enhanced asteroid impact simulation using real NASA data"""
     
     try:
         params = simulation_request.parameters
         
         # Get asteroid data (from cache or NASA API)
-        asteroid = await _get_asteroid_data(params.asteroid_nasa_id)
+        asteroid = await _get_asteroid_data(db, params.asteroid_nasa_id, background_tasks)
         
         if not asteroid:
             raise HTTPException(
@@ -47,44 +104,135 @@ async def run_enhanced_simulation(simulation_request: SimulationCreate):
                 detail=f"Asteroid with NASA ID {params.asteroid_nasa_id} not found"
             )
         
-        logger.info(f"Running enhanced simulation for {asteroid.name} ({asteroid.nasa_id})")
+        logger.info("Running enhanced simulation for %s (%s)", asteroid.name, asteroid.nasa_id)
         
         # Run enhanced physics calculations
-        results = physics_engine.calculate_impact_scenario(asteroid, params)
+        results = await _calculate_impact_scenario(asteroid, params)
         
         # Create simulation record
-        simulation = Simulation(
-            parameters=params,
-            results=results,
-            asteroid_data=asteroid.dict(),
-            name=simulation_request.name or f"Impact: {asteroid.name} → {params.impact_location.name}",
-            description=simulation_request.description or f"Enhanced simulation using NASA data for {asteroid.name}",
-            tags=simulation_request.tags or ["nasa-enhanced", asteroid.composition_type],
-            nasa_enhanced=True
-        )
+        simulation = _build_simulation(simulation_request, asteroid, results)
         
         # Save to database
-        result = await db.simulations.insert_one(simulation.dict())
-        simulation.id = str(result.inserted_id)
+        await db.simulations.insert_one(_simulation_document(simulation))
+        _invalidate_statistics_cache()
         
-        logger.info(f"Enhanced simulation completed and saved with ID: {simulation.id}")
+        logger.info("Enhanced simulation completed and saved with ID: %s", simulation.id)
         
-        return simulation
+        return ORJSONResponse(content=simulation.model_dump(mode="json", by_alias=True))
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Enhanced simulation failed: {str(e)}")
+        logger.error("Enhanced simulation failed: %s", e)
         raise HTTPException(
             status_code=500, 
             detail=f"Simulation failed: {str(e)}"
         )
 
-@router.get("/simulations", response_model=List[Simulation])
+@router.post("/run/batch")
+async def run_enhanced_simulation_batch(
+    simulation_requests: List[SimulationCreate],
+    background_tasks: BackgroundTasks,
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Run several enhanced simulations and save them in one bulk write"""
+    
+    try:
+        if not simulation_requests or len(simulation_requests) > MAX_BATCH_SIMULATIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Must submit between 1 and {MAX_BATCH_SIMULATIONS} simulations"
+            )
+        
+        asteroids = await _get_asteroids_data(
+            db,
+            [request.parameters.asteroid_nasa_id for request in simulation_requests],
+            background_tasks
+        )
+        
+        # Run enhanced physics calculations for the whole batch at once
+        all_results = await _calculate_impact_scenarios(
+            [asteroids[request.parameters.asteroid_nasa_id] for request in simulation_requests],
+            [request.parameters for request in simulation_requests]
+        )
+        simulations = [
+            _build_simulation(request, asteroids[request.parameters.asteroid_nasa_id], results)
+            for request, results in zip(simulation_requests, all_results)
+        ]
+        
+        # Save to database in a single bulk insert
+        await db.simulations.insert_many(
+            [_simulation_document(simulation) for simulation in simulations],
+            ordered=False
+        )
+        _invalidate_statistics_cache()
+        
+        logger.info("Enhanced simulation batch completed and saved %d simulations", len(simulations))
+        
+        return {
+            "simulation_ids": [simulation.id for simulation in simulations],
+            "count": len(simulations)
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Enhanced simulation batch failed: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Simulation batch failed: {str(e)}"
+        )
+
+@router.post("/batch-scenarios")
+async def calculate_batch_scenarios(
+    scenarios: List[ImpactParameters],
+    background_tasks: BackgroundTasks,
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """Calculate many impact scenarios without saving them"""
+    
+    try:
+        if not scenarios or len(scenarios) > MAX_BATCH_SCENARIOS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Must submit between 1 and {MAX_BATCH_SCENARIOS} scenarios"
+            )
+        
+        asteroids = await _get_asteroids_data(
+            db,
+            [params.asteroid_nasa_id for params in scenarios],
+            background_tasks
+        )
+        
+        all_results = await _calculate_impact_scenarios(
+            [asteroids[params.asteroid_nasa_id] for params in scenarios],
+            scenarios
+        )
+        
+        return ORJSONResponse(content=[
+            {
+                "parameters": params.model_dump(mode="json"),
+                "results": results.model_dump(mode="json")
+            }
+            for params, results in zip(scenarios, all_results)
+        ])
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Batch scenario calculation failed: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch scenario calculation failed: {str(e)}"
+        )
+
+@router.get("/simulations")
 async def get_simulations(
     limit: int = 20,
     nasa_enhanced_only: bool = False,
-    asteroid_type: Optional[str] = None
+    asteroid_type: Optional[str] = None,
+    validate: bool = False,
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Get list of saved simulations"""
     
@@ -96,50 +244,80 @@ async def get_simulations(
         if asteroid_type:
             query["tags"] = asteroid_type
         
-        # Fetch simulations
-        simulations_data = await db.simulations.find(
+        # Fetch simulations, leaving out the heavy blobs the list view never shows
+        cursor = db.simulations.find(
             query,
+            projection=LIST_PROJECTION,
             sort=[("created_at", -1)],
-            limit=limit
-        ).to_list(limit)
+            limit=limit,
+            batch_size=limit
+        )
         
-        simulations = [Simulation(**sim) for sim in simulations_data]
+        # Pull the first document before streaming so query errors still
+        # surface as a 500 instead of a truncated body
+        try:
+            first_simulation = await cursor.next()
+        except StopAsyncIteration:
+            return ORJSONResponse(content=[])
         
-        return simulations
+        # Documents come from our own collection, so by default they are
+        # encoded straight from Mongo without a Pydantic round-trip
+        first_chunk = b"[" + _dump_simulation_doc(first_simulation, validate)
+        
+        async def stream_simulations():
+            yield first_chunk
+            async for sim in cursor:
+                yield b"," + _dump_simulation_doc(sim, validate)
+            yield b"]"
+        
+        return StreamingResponse(stream_simulations(), media_type="application/json")
     
     except Exception as e:
-        logger.error(f"Failed to fetch simulations: {str(e)}")
+        logger.error("Failed to fetch simulations: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch simulations: {str(e)}")
 
-@router.get("/simulation/{simulation_id}", response_model=Simulation)
-async def get_simulation(simulation_id: str):
+async def _simulation_response(db: AsyncIOMotorDatabase, object_id: ObjectId) -> ORJSONResponse:
+    """Load one simulation with its asteroid data, or raise a 404"""
+    simulations_data = await db.simulations.aggregate([
+        {"$match": {"_id": object_id}},
+        *ASTEROID_LOOKUP_STAGES
+    ]).to_list(1)
+    
+    if not simulations_data:
+        raise HTTPException(status_code=404, detail="Simulation not found")
+    
+    simulation_data = simulations_data[0]
+    simulation_data['_id'] = str(simulation_data['_id'])
+    simulation = Simulation(**simulation_data)
+    return ORJSONResponse(content=simulation.model_dump(mode="json", by_alias=True))
+
+@router.get("/simulation/{simulation_id}")
+async def get_simulation(
+    simulation_id: str,
+    object_id: ObjectId = Depends(_simulation_oid),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
     """Get specific simulation by ID"""
     
     try:
-        if not ObjectId.is_valid(simulation_id):
-            raise HTTPException(status_code=400, detail="Invalid simulation ID format")
-        
-        simulation_data = await db.simulations.find_one({"_id": ObjectId(simulation_id)})
-        
-        if not simulation_data:
-            raise HTTPException(status_code=404, detail="Simulation not found")
-        
-        return Simulation(**simulation_data)
+        return await _simulation_response(db, object_id)
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to fetch simulation {simulation_id}: {str(e)}")
+        logger.error("Failed to fetch simulation %s: %s", simulation_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch simulation: {str(e)}")
 
-@router.put("/simulation/{simulation_id}", response_model=Simulation)
-async def update_simulation(simulation_id: str, update_request: SimulationUpdate):
+@router.put("/simulation/{simulation_id}")
+async def update_simulation(
+    simulation_id: str,
+    update_request: SimulationUpdate,
+    object_id: ObjectId = Depends(_simulation_oid),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
     """Update simulation metadata"""
     
     try:
-        if not ObjectId.is_valid(simulation_id):
-            raise HTTPException(status_code=400, detail="Invalid simulation ID format")
-        
         # Build update query
         update_data = {"updated_at": datetime.utcnow()}
         
@@ -154,46 +332,48 @@ async def update_simulation(simulation_id: str, update_request: SimulationUpdate
         
         # Update simulation
         result = await db.simulations.update_one(
-            {"_id": ObjectId(simulation_id)},
+            {"_id": object_id},
             {"$set": update_data}
         )
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Simulation not found")
+        _invalidate_statistics_cache()
         
-        # Return updated simulation
-        simulation_data = await db.simulations.find_one({"_id": ObjectId(simulation_id)})
-        return Simulation(**simulation_data)
+        # Return updated simulation, joined with its asteroid like GET
+        return await _simulation_response(db, object_id)
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to update simulation {simulation_id}: {str(e)}")
+        logger.error("Failed to update simulation %s: %s", simulation_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to update simulation: {str(e)}")
 
 @router.delete("/simulation/{simulation_id}")
-async def delete_simulation(simulation_id: str):
+async def delete_simulation(
+    simulation_id: str,
+    object_id: ObjectId = Depends(_simulation_oid),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
     """Delete simulation"""
     
     try:
-        if not ObjectId.is_valid(simulation_id):
-            raise HTTPException(status_code=400, detail="Invalid simulation ID format")
-        
-        result = await db.simulations.delete_one({"_id": ObjectId(simulation_id)})
+        result = await db.simulations.delete_one({"_id": object_id})
         
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Simulation not found")
+        _invalidate_statistics_cache()
         
         return {"message": "Simulation deleted successfully"}
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete simulation {simulation_id}: {str(e)}")
+        logger.error("Failed to delete simulation %s: %s", simulation_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to delete simulation: {str(e)}")
 
 @router.post("/compare")
-async def compare_simulations(simulation_ids: List[str]):
+async def compare_simulations(simulation_ids: List[str], db: AsyncIOMotorDatabase = Depends(get_db)):
     """Compare multiple simulations side by side"""
     
     try:
@@ -203,21 +383,42 @@ async def compare_simulations(simulation_ids: List[str]):
                 detail="Must compare between 2 and 5 simulations"
             )
         
-        # Validate and fetch simulations
-        simulations = []
-        for sim_id in simulation_ids:
-            if not ObjectId.is_valid(sim_id):
-                raise HTTPException(status_code=400, detail=f"Invalid simulation ID: {sim_id}")
-            
-            sim_data = await db.simulations.find_one({"_id": ObjectId(sim_id)})
-            if not sim_data:
-                raise HTTPException(status_code=404, detail=f"Simulation not found: {sim_id}")
-            
-            simulations.append(Simulation(**sim_data))
+        # Validate all IDs up front
+        object_ids = [_oid(sim_id, f"Invalid simulation ID: {sim_id}") for sim_id in simulation_ids]
+        
+        # Fetch all simulations in a single round-trip
+        simulations_data = await db.simulations.aggregate([
+            {"$match": {"_id": {"$in": object_ids}}},
+            {"$project": {"results.timeline": 0}},
+            *ASTEROID_LOOKUP_STAGES
+        ]).to_list(len(object_ids))
+        
+        by_id = {}
+        for sim_data in simulations_data:
+            sim_data['_id'] = str(sim_data['_id'])
+            by_id[sim_data['_id']] = sim_data
+        
+        missing = [
+            sim_id for sim_id, oid in zip(simulation_ids, object_ids)
+            if str(oid) not in by_id
+        ]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Simulation not found: {', '.join(missing)}")
+        
+        # Preserve the requested order
+        simulations = [Simulation(**by_id[str(oid)]) for oid in object_ids]
         
         # Build comparison matrix
         comparison = {
-            "simulations": [sim.dict() for sim in simulations],
+            "simulations": [
+                {
+                    "id": sim.id,
+                    "name": sim.name,
+                    "location": sim.parameters.impact_location.name,
+                    "asteroid": sim.parameters.asteroid_nasa_id
+                }
+                for sim in simulations
+            ],
             "comparison_matrix": _build_comparison_matrix(simulations),
             "summary": _generate_comparison_summary(simulations)
         }
@@ -227,75 +428,145 @@ async def compare_simulations(simulation_ids: List[str]):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to compare simulations: {str(e)}")
+        logger.error("Failed to compare simulations: %s", e)
         raise HTTPException(status_code=500, detail=f"Comparison failed: {str(e)}")
 
 @router.get("/statistics")
-async def get_simulation_statistics():
+async def get_simulation_statistics(db: AsyncIOMotorDatabase = Depends(get_db)):
     """Get aggregate statistics across all simulations"""
     
     try:
-        # Basic counts
-        total_sims = await db.simulations.count_documents({})
-        nasa_enhanced = await db.simulations.count_documents({"nasa_enhanced": True})
-        
-        # Most simulated asteroids
-        popular_asteroids = await db.simulations.aggregate([
-            {"$match": {"nasa_enhanced": True}},
-            {"$group": {
-                "_id": "$asteroid_data.nasa_id",
-                "name": {"$first": "$asteroid_data.name"},
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]).to_list(10)
-        
-        # Impact location distribution
-        impact_locations = await db.simulations.aggregate([
-            {"$group": {
-                "_id": "$parameters.impact_location.name",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]).to_list(10)
-        
-        # Average impact metrics (for NASA enhanced simulations)
-        avg_metrics = await db.simulations.aggregate([
-            {"$match": {"nasa_enhanced": True, "results": {"$exists": True}}},
-            {"$group": {
-                "_id": None,
-                "avg_energy_mt": {"$avg": {"$toDouble": "$results.immediate.energy.value"}},
-                "avg_crater_km": {"$avg": {"$toDouble": "$results.immediate.craterDiameter.value"}}
-            }}
-        ]).to_list(1)
+        async with _statistics_cache_lock:
+            statistics = _statistics_cache.get(STATISTICS_CACHE_KEY)
+            if statistics is None:
+                statistics = await _compute_simulation_statistics(db)
+                _statistics_cache[STATISTICS_CACHE_KEY] = statistics
         
-        return {
-            "total_simulations": total_sims,
-            "nasa_enhanced_count": nasa_enhanced,
-            "enhancement_rate": (nasa_enhanced / total_sims * 100) if total_sims > 0 else 0,
-            "popular_asteroids": popular_asteroids,
-            "popular_locations": impact_locations,
-            "average_metrics": avg_metrics[0] if avg_metrics else {},
-            "last_simulation": (await db.simulations.find_one(
-                {},
-                sort=[("created_at", -1)]
-            ) or {}).get("created_at")
-        }
+        return statistics
     
     except Exception as e:
-        logger.error(f"Failed to get simulation statistics: {str(e)}")
+        logger.error("Failed to get simulation statistics: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
 # Helper functions
 
-async def _get_asteroid_data(nasa_id: str) -> Optional[Asteroid]:
+async def _compute_simulation_statistics(db: AsyncIOMotorDatabase) -> dict:
+    """Aggregate statistics across all simulations"""
+    
+    # Compute the aggregate statistics in one server-side pass over the
+    # collection. $facet sub-pipelines cannot use indexes, so the latest
+    # simulation is read separately through the created_at index and both
+    # queries run concurrently.
+    facets_query = db.simulations.aggregate([
+        {"$facet": {
+            # Basic counts
+            "total": [{"$count": "count"}],
+            "nasa_enhanced": [
+                {"$match": {"nasa_enhanced": True}},
+                {"$count": "count"}
+            ],
+            
+            # Most simulated asteroids
+            "popular_asteroids": [
+                {"$match": {"nasa_enhanced": True}},
+                {"$group": {
+                    "_id": "$parameters.asteroid_nasa_id",
+                    "count": {"$sum": 1}
+                }},
+                {"$sort": {"count": -1}},
+                {"$limit": 10},
+                # Join names only for the ten winners
+                {"$lookup": {
+                    "from": "asteroids",
+                    "localField": "_id",
+                    "foreignField": "nasa_id",
+                    "as": "asteroid"
+                }},
+                {"$project": {
+                    "count": 1,
+                    "name": {"$arrayElemAt": ["$asteroid.name", 0]}
+                }}
+            ],
+            
+            # Impact location distribution
+            "popular_locations": [
+                {"$group": {
+                    "_id": "$parameters.impact_location.name",
+                    "count": {"$sum": 1}
+                }},
+                {"$sort": {"count": -1}},
+                {"$limit": 10}
+            ],
+            
+            # Average impact metrics (for NASA enhanced simulations)
+            "average_metrics": [
+                {"$match": {"nasa_enhanced": True, "results": {"$exists": True}}},
+                {"$group": {
+                    "_id": None,
+                    "avg_energy_mt": {"$avg": "$results.immediate.energy.value_numeric"},
+                    "avg_crater_km": {"$avg": "$results.immediate.craterDiameter.value_numeric"}
+                }}
+            ]
+        }}
+    ]).to_list(1)
+    last_simulation_query = db.simulations.find_one(
+        {},
+        projection={"_id": 0, "created_at": 1},
+        sort=[("created_at", -1)]
+    )
+    facets, last_simulation = await asyncio.gather(facets_query, last_simulation_query)
+    facets = facets[0]
+    
+    total_sims = facets["total"][0]["count"] if facets["total"] else 0
+    nasa_enhanced = facets["nasa_enhanced"][0]["count"] if facets["nasa_enhanced"] else 0
+    
+    return {
+        "total_simulations": total_sims,
+        "nasa_enhanced_count": nasa_enhanced,
+        "enhancement_rate": (nasa_enhanced / total_sims * 100) if total_sims > 0 else 0,
+        "popular_asteroids": facets["popular_asteroids"],
+        "popular_locations": facets["popular_locations"],
+        "average_metrics": facets["average_metrics"][0] if facets["average_metrics"] else {},
+        "last_simulation": (last_simulation or {}).get("created_at")
+    }
+
+def _mongo_to_json(doc: dict) -> dict:
+    """Make a raw Mongo document JSON-serializable"""
+    # orjson already encodes datetimes as ISO 8601, so only the ObjectId needs converting
+    doc['_id'] = str(doc['_id'])
+    return doc
+
+def _dump_simulation_doc(sim: dict, validate: bool = False) -> bytes:
+    """Encode a simulation document as JSON, optionally validating it first"""
+    sim = _mongo_to_json(sim)
+    if validate:
+        sim = Simulation(**sim).model_dump(mode="json", by_alias=True)
+    return orjson.dumps(sim)
+
+def _invalidate_statistics_cache():
+    """Drop cached statistics after the simulations collection changes"""
+    _statistics_cache.pop(STATISTICS_CACHE_KEY, None)
+
+async def _get_asteroid_data(
+    db: AsyncIOMotorDatabase,
+    nasa_id: str,
+    background_tasks: Optional[BackgroundTasks] = None
+) -> Optional[Asteroid]:
     """Get asteroid data from cache or NASA API"""
     
-    # Try cache first
-    cached_asteroid = await db.asteroids.find_one({"nasa_id": nasa_id})
+    # Try cache first, skipping the raw NASA payload the physics never reads
+    cached_asteroid = await db.asteroids.find_one(
+        {"nasa_id": nasa_id},
+        projection={"nasa_data": 0}
+    )
     if cached_asteroid:
+        # Serve stale entries immediately and refresh them after the response
+        last_updated = cached_asteroid.get("last_updated")
+        if background_tasks is not None and (
+            last_updated is None or datetime.utcnow() - last_updated > ASTEROID_CACHE_MAX_AGE
+        ):
+            background_tasks.add_task(_refresh_asteroid, db, nasa_id)
+        
         # Convert ObjectId to string for Pydantic model
         if '_id' in cached_asteroid:
             cached_asteroid['_id'] = str(cached_asteroid['_id'])
@@ -303,59 +574,146 @@ async def _get_asteroid_data(nasa_id: str) -> Optional[Asteroid]:
     
     # Fetch from NASA API
     try:
-        async with nasa_neo_service as service:
-            neo_data = await service.get_neo_by_id(nasa_id)
-            asteroid = service.parse_neo_to_asteroid(neo_data)
-            
-            # Cache the result
-            asteroid_dict = asteroid.dict()
-            asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
-            await db.asteroids.update_one(
-                {"nasa_id": asteroid.nasa_id},
-                {"$set": asteroid_dict},
-                upsert=True
-            )
-            
-            return asteroid
+        return await _fetch_asteroid(db, nasa_id)
     
     except Exception as e:
-        logger.error(f"Failed to fetch asteroid data for {nasa_id}: {str(e)}")
+        logger.error("Failed to fetch asteroid data for %s: %s", nasa_id, e)
         return None
 
+async def _get_asteroids_data(
+    db: AsyncIOMotorDatabase,
+    nasa_ids: List[str],
+    background_tasks: BackgroundTasks
+) -> Dict[str, Asteroid]:
+    """Get each distinct asteroid once, concurrently; 404 if any is missing"""
+    
+    unique_ids = list(dict.fromkeys(nasa_ids))
+    asteroids = dict(zip(unique_ids, await asyncio.gather(
+        *(_get_asteroid_data(db, nasa_id, background_tasks) for nasa_id in unique_ids)
+    )))
+    
+    missing = [nasa_id for nasa_id, asteroid in asteroids.items() if not asteroid]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Asteroids with NASA IDs {', '.join(missing)} not found"
+        )
+    
+    return asteroids
+
+async def _fetch_asteroid(db: AsyncIOMotorDatabase, nasa_id: str) -> Asteroid:
+    """Fetch asteroid data from NASA API and update the cache"""
+    
+    neo_data = await nasa_neo_service.get_neo_by_id(nasa_id)
+    asteroid = nasa_neo_service.parse_neo_to_asteroid(neo_data)
+    
+    # Cache the result
+    asteroid_dict = asteroid.model_dump(exclude={"nasa_data"})  # Fields are parsed out; skip the raw payload
+    asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
+    await db.asteroids.update_one(
+        {"nasa_id": asteroid.nasa_id},
+        {"$set": asteroid_dict, "$unset": {"nasa_data": ""}},
+        upsert=True
+    )
+    await asteroids_changed(db)
+    
+    return asteroid
+
+async def _refresh_asteroid(db: AsyncIOMotorDatabase, nasa_id: str):
+    """Background refresh of a stale cached asteroid"""
+    
+    try:
+        await _fetch_asteroid(db, nasa_id)
+    except Exception as e:
+        logger.warning("Failed to refresh cached asteroid %s: %s", nasa_id, e)
+
+def start_physics_pool():
+    """Create the physics worker pool; called from the startup hook"""
+    global physics_pool
+    
+    # Workers come from a forkserver rather than being forked from the app,
+    # which by now has database and executor threads running
+    if physics_pool is None:
+        physics_pool = ProcessPoolExecutor(
+            max_workers=PHYSICS_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=warm_up_physics_kernels
+        )
+
+def stop_physics_pool():
+    """Shut the physics worker pool down"""
+    global physics_pool
+    
+    if physics_pool is not None:
+        physics_pool.shutdown()
+        physics_pool = None
+
+async def warm_physics_pool():
+    """Compile the physics kernels so it happens before the first request"""
+    # This fills Numba's on-disk cache, so each worker's initializer loads
+    # the compiled kernels from there rather than compiling its own
+    await asyncio.to_thread(warm_up_physics_kernels)
+
+async def _calculate_impact_scenario(asteroid: Asteroid, params: ImpactParameters) -> ImpactResults:
+    """Run the physics engine in the process pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        physics_pool, physics_engine.calculate_impact_scenario, asteroid, params
+    )
+
+async def _calculate_impact_scenarios(
+    asteroids: List[Asteroid],
+    params: List[ImpactParameters]
+) -> List[ImpactResults]:
+    """Run the vectorized batch physics in the process pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        physics_pool, physics_engine.calculate_impact_scenario_batch, asteroids, params
+    )
+
+def _build_simulation(
+    simulation_request: SimulationCreate,
+    asteroid: Asteroid,
+    results: ImpactResults
+) -> Simulation:
+    """Build a simulation record from a request and its physics results"""
+    
+    params = simulation_request.parameters
+    return Simulation(
+        parameters=params,
+        results=results,
+        asteroid_data=asteroid.model_dump(mode="python"),
+        name=simulation_request.name or f"Impact: {asteroid.name} → {params.impact_location.name}",
+        description=simulation_request.description or f"Enhanced simulation using NASA data for {asteroid.name}",
+        tags=simulation_request.tags or ["nasa-enhanced", asteroid.composition_type],
+        nasa_enhanced=True
+    )
+
+def _simulation_document(simulation: Simulation) -> dict:
+    """Build the Mongo document for a new simulation and assign its ID"""
+    
+    # The ObjectId is assigned up front so the document only has to be
+    # dumped once. The asteroid record is not embedded; reads join it back
+    # in from the asteroids collection.
+    sim_doc = simulation.model_dump(mode="python", by_alias=True, exclude={"asteroid_data"})
+    sim_doc["_id"] = ObjectId()
+    simulation.id = str(sim_doc["_id"])
+    return sim_doc
+
 def _build_comparison_matrix(simulations: List[Simulation]) -> dict:
     """Build comparison matrix for simulations"""
     
-    matrix = {
-        "crater_diameters": [],
-        "energies": [],
-        "casualties": [],
-        "shockwave_radii": []
-    }
+    matrix = {key: [] for key in COMPARISON_METRICS}
     
     for sim in simulations:
-        if sim.results:
-            matrix["crater_diameters"].append({
-                "simulation_id": sim.id,
-                "name": sim.name,
-                "value": sim.results.immediate.get("craterDiameter", {}).value or "0"
-            })
-            
-            matrix["energies"].append({
-                "simulation_id": sim.id,
-                "name": sim.name,
-                "value": sim.results.immediate.get("energy", {}).value or "0"
-            })
-            
-            matrix["casualties"].append({
-                "simulation_id": sim.id,
-                "name": sim.name,
-                "value": sim.results.human_impact.get("casualtiesImmediate", {}).value or "0"
-            })
-            
-            matrix["shockwave_radii"].append({
+        if not sim.results:
+            continue
+        for key, (section, metric_name) in COMPARISON_METRICS.items():
+            metric = getattr(sim.results, section).get(metric_name)
+            matrix[key].append({
                 "simulation_id": sim.id,
                 "name": sim.name,
-                "value": sim.results.environmental.get("shockwaveRadius", {}).value or "0"
+                "value": (metric.value if metric else None) or "0"
             })
     
     return matrix
@@ -1,30 +1,42 @@
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Depends, Response
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 from typing import List, Optional
+from collections import OrderedDict
+from cachetools import TTLCache
+import asyncio
 import logging
+import orjson
+from database import get_db
 from services.nasa_neo_service import nasa_neo_service
+from services.neo_cache import (
+    asteroids_cache, asteroid_cache, featured_cache, stats_cache,
+    invalidate_neo_caches, asteroids_changed
+)
 from models.asteroid import Asteroid, AsteroidFilter, AsteroidSearchResult
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/neo", tags=["NASA NEO Integration"])
 
-def get_database():
-    """Get database connection"""
-    from motor.motor_asyncio import AsyncIOMotorClient
-    import os
-    from dotenv import load_dotenv
-    from pathlib import Path
-    
-    # Load environment variables
-    ROOT_DIR = Path(__file__).parent.parent
-    load_dotenv(ROOT_DIR / '.env')
-    
-    mongo_url = os.environ['MONGO_URL']
-    client = AsyncIOMotorClient(mongo_url)
-    return client[os.environ['DB_NAME']]
+# List of famous asteroid NASA IDs
+FEATURED_ASTEROIDS = [
+    "2000433",   # Eros
+    "3554375",   # Bennu (101955 Bennu)
+    "99942",     # Apophis  
+    "1566",      # Icarus
+    "4179",      # Toutatis
+    "25143",     # Itokawa
+]
 
-# Initialize database connection
-db = get_database()
+# Sync 10 pages (200 asteroids), checkpointing progress under this id
+SYNC_PAGES = 10
+SYNC_STATE_ID = "neo"
+
+# Parsed asteroids keyed by (nasa_id, last_updated), so an unchanged document
+# isn't validated through the Asteroid model again
+PARSED_CACHE_SIZE = 1024
+_parsed_cache: "OrderedDict[tuple, Asteroid]" = OrderedDict()
 
 @router.get("/asteroids", response_model=AsteroidSearchResult)
 async def get_asteroids(
@@ -32,7 +44,8 @@ async def get_asteroids(
     diameter_min_km: Optional[float] = Query(None, ge=0.001, description="Minimum diameter in kilometers"),
     diameter_max_km: Optional[float] = Query(None, ge=0.001, description="Maximum diameter in kilometers"),
     potentially_hazardous: Optional[bool] = Query(None, description="Filter by potentially hazardous asteroids"),
-    refresh_cache: bool = Query(False, description="Force refresh from NASA API")
+    refresh_cache: bool = Query(False, description="Force refresh from NASA API"),
+    db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """Get real asteroids from NASA NEO database with filtering"""
     
@@ -44,11 +57,27 @@ async def get_asteroids(
             potentially_hazardous=potentially_hazardous
         )
         
+        # Serve the rendered response while it is fresh
+        cache_key = f"{limit}:{diameter_min_km}:{diameter_max_km}:{potentially_hazardous}"
+        if not refresh_cache and cache_key in asteroids_cache:
+            return _json_response(asteroids_cache[cache_key])
+        
         # Check cache first (unless refresh requested)
         if not refresh_cache:
+            # Apply the filters in Mongo rather than returning arbitrary asteroids
+            query = {"is_active": True}
+            if diameter_min_km is not None:
+                query.setdefault("estimated_diameter_km", {})["$gte"] = diameter_min_km
+            if diameter_max_km is not None:
+                query.setdefault("estimated_diameter_km", {})["$lte"] = diameter_max_km
+            if potentially_hazardous is not None:
+                query["potentially_hazardous"] = potentially_hazardous
+            
             cached_asteroids = await db.asteroids.find(
-                {"is_active": True},
-                limit=limit
+                query,
+                projection={"nasa_data": 0},  # The raw NASA payload isn't needed for lists
+                limit=limit,
+                batch_size=limit
             ).to_list(limit)
             
             if cached_asteroids:
@@ -56,79 +85,77 @@ async def get_asteroids(
                 for asteroid_data in cached_asteroids:
                     if '_id' in asteroid_data:
                         asteroid_data['_id'] = str(asteroid_data['_id'])
-                asteroids = [Asteroid(**asteroid) for asteroid in cached_asteroids]
-                return AsteroidSearchResult(
-                    asteroids=asteroids,
-                    total=len(asteroids),
-                    limit=limit,
-                    offset=0,
-                    has_more=len(asteroids) == limit
-                )
+                
+                # Documents come from our own collection, so they are returned
+                # as-is instead of being validated through the Asteroid model
+                return _cache_response(asteroids_cache, cache_key, {
+                    "asteroids": cached_asteroids,
+                    "total": len(cached_asteroids),
+                    "limit": limit,
+                    "offset": 0,
+                    "has_more": len(cached_asteroids) == limit
+                })
         
         # Fetch from NASA API
-        async with nasa_neo_service as service:
-            neo_data_list = await service.search_asteroids(filters)
-            
-            asteroids = []
-            for neo_data in neo_data_list:
-                try:
-                    asteroid = service.parse_neo_to_asteroid(neo_data)
-                    
-                    # Cache in database
-                    asteroid_dict = asteroid.dict()
-                    asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
-                    await db.asteroids.update_one(
-                        {"nasa_id": asteroid.nasa_id},
-                        {"$set": asteroid_dict},
-                        upsert=True
-                    )
-                    
-                    asteroids.append(asteroid)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to parse NEO data: {str(e)}")
-                    continue
-            
-            return AsteroidSearchResult(
-                asteroids=asteroids,
-                total=len(asteroids),
-                limit=limit,
-                offset=0,
-                has_more=len(asteroids) == limit
+        neo_data_list = await nasa_neo_service.search_asteroids(filters)
+        
+        # Parse off the event loop so other requests aren't stalled
+        asteroids = await asyncio.to_thread(nasa_neo_service.parse_neos, neo_data_list, False)
+        
+        # Cache in database
+        if asteroids:
+            await db.asteroids.bulk_write(
+                [_asteroid_upsert(a, include_approaches=False) for a in asteroids], ordered=False
             )
+            await asteroids_changed(db)
+        
+        result = AsteroidSearchResult(
+            asteroids=asteroids,
+            total=len(asteroids),
+            limit=limit,
+            offset=0,
+            has_more=len(asteroids) == limit
+        )
+        return _cache_response(asteroids_cache, cache_key, result.model_dump(mode="json", by_alias=True))
     
     except Exception as e:
         logger.error(f"Failed to fetch asteroids: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch asteroid data: {str(e)}")
 
 @router.get("/asteroid/{nasa_id}", response_model=Asteroid)
-async def get_asteroid_by_id(nasa_id: str):
+async def get_asteroid_by_id(nasa_id: str, db: AsyncIOMotorDatabase = Depends(get_db)):
     """Get detailed asteroid data by NASA NEO ID"""
     
     try:
-        # Check cache first
-        cached_asteroid = await db.asteroids.find_one({"nasa_id": nasa_id})
+        if nasa_id in asteroid_cache:
+            return _json_response(asteroid_cache[nasa_id])
+        
+        # Check cache first; asteroids cached from list views lack close approaches
+        cached_asteroid = await db.asteroids.find_one(
+            {"nasa_id": nasa_id, "close_approaches": {"$exists": True}}
+        )
         if cached_asteroid:
             # Convert ObjectId to string for Pydantic model
             if '_id' in cached_asteroid:
                 cached_asteroid['_id'] = str(cached_asteroid['_id'])
-            return Asteroid(**cached_asteroid)
+            asteroid = Asteroid(**cached_asteroid)
+            return _cache_response(asteroid_cache, nasa_id, asteroid.model_dump(mode="json", by_alias=True))
         
         # Fetch from NASA API
-        async with nasa_neo_service as service:
-            neo_data = await service.get_neo_by_id(nasa_id)
-            asteroid = service.parse_neo_to_asteroid(neo_data)
-            
-            # Cache the result
-            asteroid_dict = asteroid.dict()
-            asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
-            await db.asteroids.update_one(
-                {"nasa_id": asteroid.nasa_id},
-                {"$set": asteroid_dict},
-                upsert=True
-            )
-            
-            return asteroid
+        neo_data = await nasa_neo_service.get_neo_by_id(nasa_id)
+        asteroid = nasa_neo_service.parse_neo_to_asteroid(neo_data)
+        
+        # Cache the result
+        asteroid_dict = asteroid.model_dump(exclude={"nasa_data"})  # Fields are parsed out; skip the raw payload
+        asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
+        await db.asteroids.update_one(
+            {"nasa_id": asteroid.nasa_id},
+            {"$set": asteroid_dict, "$unset": {"nasa_data": ""}},
+            upsert=True
+        )
+        await asteroids_changed(db)
+        
+        return _cache_response(asteroid_cache, nasa_id, asteroid.model_dump(mode="json", by_alias=True))
     
     except Exception as e:
         logger.error(f"Failed to fetch asteroid {nasa_id}: {str(e)}")
@@ -142,94 +169,103 @@ async def get_close_approaches(
     """Get asteroids with upcoming close approaches to Earth"""
     
     try:
-        async with nasa_neo_service as service:
-            approaching_asteroids = await service.get_recent_close_approaches(days_ahead)
-            
-            # Limit results
-            limited_asteroids = approaching_asteroids[:limit]
-            
-            # Parse and enhance with our models
-            enhanced_approaches = []
-            for neo_data in limited_asteroids:
-                try:
-                    asteroid = service.parse_neo_to_asteroid(neo_data)
-                    
-                    # Add approach date from the feed data
-                    approach_info = {
-                        "asteroid": asteroid.dict(),
-                        "approach_date": neo_data.get('approach_date'),
-                        "closest_approach_km": min([
-                            float(app.get('miss_distance', {}).get('kilometers', float('inf')))
-                            for app in neo_data.get('close_approach_data', [{}])
-                        ]),
-                        "relative_velocity_kms": [
-                            float(app.get('relative_velocity', {}).get('kilometers_per_second', 0))
-                            for app in neo_data.get('close_approach_data', [])
-                        ][0] if neo_data.get('close_approach_data') else 0
-                    }
-                    
-                    enhanced_approaches.append(approach_info)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to parse approaching asteroid: {str(e)}")
-                    continue
-            
-            return {
-                "approaching_asteroids": enhanced_approaches,
-                "total_found": len(approaching_asteroids),
-                "returned": len(enhanced_approaches),
-                "days_ahead": days_ahead
-            }
+        limited_asteroids, total_found = await nasa_neo_service.get_recent_close_approaches(days_ahead, limit)
+        
+        # Parse and enhance with our models off the event loop
+        enhanced_approaches = await asyncio.to_thread(_build_close_approaches, limited_asteroids)
+        
+        return {
+            "approaching_asteroids": enhanced_approaches,
+            "total_found": total_found,
+            "returned": len(enhanced_approaches),
+            "days_ahead": days_ahead
+        }
     
     except Exception as e:
         logger.error(f"Failed to fetch close approaches: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch close approach data: {str(e)}")
 
+def _build_close_approaches(neo_data_list: List[dict]) -> List[dict]:
+    """Parse approaching NEOs into response entries, skipping any that fail"""
+    enhanced_approaches = []
+    for neo_data in neo_data_list:
+        try:
+            asteroid = nasa_neo_service.parse_neo_to_asteroid(neo_data)
+            
+            # Add approach date from the feed data
+            approach_info = {
+                "asteroid": asteroid.model_dump(mode="json"),
+                "approach_date": neo_data.get('approach_date'),
+                "closest_approach_km": neo_data['_min_miss_km'],
+                "relative_velocity_kms": next((
+                    float(app.get('relative_velocity', {}).get('kilometers_per_second', 0))
+                    for app in neo_data.get('close_approach_data', ())
+                ), 0)
+            }
+            
+            enhanced_approaches.append(approach_info)
+            
+        except Exception as e:
+            logger.warning(f"Failed to parse approaching asteroid: {str(e)}")
+            continue
+    
+    return enhanced_approaches
+
 @router.post("/sync")
-async def sync_nasa_data(background_tasks: BackgroundTasks):
+async def sync_nasa_data(background_tasks: BackgroundTasks, db: AsyncIOMotorDatabase = Depends(get_db)):
     """Background task to sync NASA NEO database"""
     
     async def sync_task():
         try:
-            logger.info("Starting NASA NEO database sync...")
+            # Resume after the last page an interrupted sync completed
+            state = await db.sync_state.find_one({"_id": SYNC_STATE_ID})
+            first_page = state["last_page"] + 1 if state else 0
+            logger.info(f"Starting NASA NEO database sync from page {first_page}...")
             
-            async with nasa_neo_service as service:
-                # Fetch multiple pages of asteroids
-                total_synced = 0
-                
-                for page in range(10):  # Sync 10 pages (200 asteroids)
-                    try:
-                        browse_data = await service.get_neo_browse(limit=20, page=page)
-                        neos = browse_data.get('near_earth_objects', [])
-                        
-                        if not neos:
-                            break
-                        
-                        for neo_data in neos:
-                            try:
-                                asteroid = service.parse_neo_to_asteroid(neo_data)
-                                
-                                # Upsert to database
-                                asteroid_dict = asteroid.dict()
-                                asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
-                                await db.asteroids.update_one(
-                                    {"nasa_id": asteroid.nasa_id},
-                                    {"$set": asteroid_dict},
-                                    upsert=True
-                                )
-                                
-                                total_synced += 1
-                                
-                            except Exception as e:
-                                logger.warning(f"Failed to sync asteroid: {str(e)}")
-                                continue
+            # Fetch multiple pages of asteroids concurrently
+            total_synced = 0
+            completed = True
+            pages = range(first_page, SYNC_PAGES)
+            browse_pages = await asyncio.gather(
+                *(nasa_neo_service.get_neo_browse(limit=20, page=page) for page in pages),
+                return_exceptions=True
+            )
+            
+            for page, browse_data in zip(pages, browse_pages):
+                try:
+                    if isinstance(browse_data, Exception):
+                        raise browse_data
+                    neos = browse_data.get('near_earth_objects', [])
                     
-                    except Exception as e:
-                        logger.error(f"Failed to sync page {page}: {str(e)}")
+                    if not neos:
                         break
+                    
+                    asteroids = await asyncio.to_thread(nasa_neo_service.parse_neos, neos, False)
+                    operations = [_asteroid_upsert(a, include_approaches=False) for a in asteroids]
+                    
+                    # Upsert the whole page in one round-trip, then checkpoint it
+                    if operations:
+                        await db.asteroids.bulk_write(operations, ordered=False)
+                        total_synced += len(operations)
+                    await db.sync_state.update_one(
+                        {"_id": SYNC_STATE_ID}, {"$set": {"last_page": page}}, upsert=True
+                    )
                 
-                logger.info(f"NASA NEO sync completed. Synced {total_synced} asteroids.")
-                
+                except Exception as e:
+                    logger.error(f"Failed to sync page {page}: {str(e)}")
+                    completed = False
+                    break
+            
+            # A finished sync starts from the first page next time
+            if completed:
+                await db.sync_state.delete_one({"_id": SYNC_STATE_ID})
+            
+            invalidate_neo_caches()
+            logger.info(f"NASA NEO sync completed. Synced {total_synced} asteroids.")
+            
+            # Precompute the stats and featured views so those endpoints are plain reads
+            await _refresh_neo_views(db)
+            
         except Exception as e:
             logger.error(f"NASA NEO sync failed: {str(e)}")
     
@@ -241,106 +277,187 @@ async def sync_nasa_data(background_tasks: BackgroundTasks):
     }
 
 @router.get("/stats")
-async def get_neo_stats():
+async def get_neo_stats(db: AsyncIOMotorDatabase = Depends(get_db)):
     """Get statistics about cached NEO data"""
     
     try:
-        total_asteroids = await db.asteroids.count_documents({"is_active": True})
-        hazardous_count = await db.asteroids.count_documents({
-            "is_active": True,
-            "potentially_hazardous": True
-        })
+        if "stats" in stats_cache:
+            return _json_response(stats_cache["stats"])
         
-        # Size distribution
-        size_stats = await db.asteroids.aggregate([
-            {"$match": {"is_active": True}},
-            {"$group": {
-                "_id": None,
-                "avg_diameter": {"$avg": "$estimated_diameter_km"},
-                "max_diameter": {"$max": "$estimated_diameter_km"},
-                "min_diameter": {"$min": "$estimated_diameter_km"}
-            }}
-        ]).to_list(1)
+        # Read the view precomputed at sync time, building it if it's missing
+        stats = await db.neo_views.find_one({"_id": "stats"}, projection={"_id": 0})
+        if stats is None:
+            stats = await _compute_neo_stats(db)
+            await db.neo_views.replace_one({"_id": "stats"}, stats, upsert=True)
         
-        # Composition distribution
-        composition_stats = await db.asteroids.aggregate([
-            {"$match": {"is_active": True}},
-            {"$group": {
-                "_id": "$composition_type",
-                "count": {"$sum": 1}
-            }}
-        ]).to_list(10)
-        
-        return {
-            "total_asteroids": total_asteroids,
-            "potentially_hazardous": hazardous_count,
-            "size_statistics": size_stats[0] if size_stats else {},
-            "composition_distribution": composition_stats,
-            "last_updated": (await db.asteroids.find_one(
-                {"is_active": True},
-                sort=[("last_updated", -1)]
-            ) or {}).get("last_updated")
-        }
+        return _cache_response(stats_cache, "stats", stats)
     
     except Exception as e:
         logger.error(f"Failed to get NEO stats: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
 @router.get("/featured")
-async def get_featured_asteroids():
+async def get_featured_asteroids(db: AsyncIOMotorDatabase = Depends(get_db)):
     """Get a curated list of famous/interesting asteroids"""
     
-    # List of famous asteroid NASA IDs
-    famous_asteroids = [
-        "2000433",   # Eros
-        "3554375",   # Bennu (101955 Bennu)
-        "99942",     # Apophis  
-        "1566",      # Icarus
-        "4179",      # Toutatis
-        "25143",     # Itokawa
-    ]
+    if "featured" in featured_cache:
+        return _json_response(featured_cache["featured"])
     
-    featured = []
+    # Read the view precomputed at sync time, building it if it's missing
+    response = await db.neo_views.find_one({"_id": "featured"}, projection={"_id": 0})
+    if response is None:
+        response, complete = await _build_featured(db)
+        
+        # Only a complete list is kept, so a NASA outage isn't pinned
+        if not complete:
+            return response
+        await db.neo_views.replace_one({"_id": "featured"}, response, upsert=True)
     
-    for nasa_id in famous_asteroids:
-        try:
-            # Try to get from cache first
-            cached = await db.asteroids.find_one({"nasa_id": nasa_id})
+    return _cache_response(featured_cache, "featured", response)
+
+async def _compute_neo_stats(db: AsyncIOMotorDatabase) -> dict:
+    """Aggregate statistics over the cached asteroids"""
+    # Gather every statistic in a single round-trip
+    stats = (await db.asteroids.aggregate([
+        {"$match": {"is_active": True}},
+        {"$facet": {
+            "total": [{"$count": "n"}],
+            "hazardous": [
+                {"$match": {"potentially_hazardous": True}},
+                {"$count": "n"}
+            ],
             
-            if cached:
-                asteroid = Asteroid(**cached)
-            else:
-                # Fetch from NASA API if not cached
-                try:
-                    async with nasa_neo_service as service:
-                        neo_data = await service.get_neo_by_id(nasa_id)
-                        asteroid = service.parse_neo_to_asteroid(neo_data)
-                        
-                        # Cache it
-                        asteroid_dict = asteroid.dict()
-                        asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
-                        await db.asteroids.update_one(
-                            {"nasa_id": asteroid.nasa_id},
-                            {"$set": asteroid_dict},
-                            upsert=True
-                        )
-                except:
-                    continue  # Skip if can't fetch
+            # Size distribution
+            "size": [
+                {"$group": {
+                    "_id": None,
+                    "avg_diameter": {"$avg": "$estimated_diameter_km"},
+                    "max_diameter": {"$max": "$estimated_diameter_km"},
+                    "min_diameter": {"$min": "$estimated_diameter_km"}
+                }}
+            ],
+            
+            # Composition distribution
+            "composition": [
+                {"$group": {
+                    "_id": "$composition_type",
+                    "count": {"$sum": 1}
+                }},
+                {"$limit": 10}
+            ],
             
-            featured.append({
-                "asteroid": asteroid.dict(),
-                "description": _get_asteroid_description(nasa_id),
-                "significance": _get_asteroid_significance(nasa_id)
-            })
+            "last": [
+                {"$sort": {"last_updated": -1}},
+                {"$limit": 1},
+                {"$project": {"_id": 0, "last_updated": 1}}
+            ]
+        }}
+    ]).to_list(1))[0]
+    
+    return {
+        "total_asteroids": stats["total"][0]["n"] if stats["total"] else 0,
+        "potentially_hazardous": stats["hazardous"][0]["n"] if stats["hazardous"] else 0,
+        "size_statistics": stats["size"][0] if stats["size"] else {},
+        "composition_distribution": stats["composition"],
+        "last_updated": stats["last"][0].get("last_updated") if stats["last"] else None
+    }
+
+async def _build_featured(db: AsyncIOMotorDatabase):
+    """Build the featured list, returning it with whether every asteroid loaded"""
+    featured = []
+    fetched = []
+    
+    # Look every asteroid up concurrently
+    results = await asyncio.gather(
+        *(_load_featured_asteroid(db, nasa_id) for nasa_id in FEATURED_ASTEROIDS),
+        return_exceptions=True
+    )
+    
+    for nasa_id, result in zip(FEATURED_ASTEROIDS, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to fetch featured asteroid {nasa_id}: {str(result)}")
+            continue
         
+        asteroid, from_nasa = result
+        if from_nasa:
+            fetched.append(asteroid)
+        
+        featured.append({
+            "asteroid": asteroid.model_dump(mode="json"),
+            "description": _get_asteroid_description(nasa_id),
+            "significance": _get_asteroid_significance(nasa_id)
+        })
+    
+    # Cache newly fetched asteroids together
+    if fetched:
+        try:
+            await db.asteroids.bulk_write([_asteroid_upsert(a) for a in fetched], ordered=False)
+            await asteroids_changed(db)
         except Exception as e:
-            logger.warning(f"Failed to fetch featured asteroid {nasa_id}: {str(e)}")
-            continue
+            logger.warning(f"Failed to cache featured asteroids: {str(e)}")
     
-    return {
+    response = {
         "featured_asteroids": featured,
         "count": len(featured)
     }
+    return response, len(featured) == len(FEATURED_ASTEROIDS)
+
+async def _refresh_neo_views(db: AsyncIOMotorDatabase):
+    """Store freshly computed featured and stats responses in neo_views"""
+    # Featured goes first since fetching a missing asteroid resets the stats view
+    featured, complete = await _build_featured(db)
+    if complete:
+        await db.neo_views.replace_one({"_id": "featured"}, featured, upsert=True)
+    
+    stats = await _compute_neo_stats(db)
+    await db.neo_views.replace_one({"_id": "stats"}, stats, upsert=True)
+    
+    invalidate_neo_caches()
+
+async def _load_featured_asteroid(db: AsyncIOMotorDatabase, nasa_id: str):
+    """Load a featured asteroid from the cache, falling back to the NASA API"""
+    # Only fetch the full document when the parsed copy is stale
+    current = await db.asteroids.find_one({"nasa_id": nasa_id}, projection={"last_updated": 1})
+    if current:
+        key = (nasa_id, current.get("last_updated"))
+        asteroid = _parsed_cache.get(key)
+        if asteroid is None:
+            cached = await db.asteroids.find_one({"nasa_id": nasa_id})
+            if cached:
+                cached['_id'] = str(cached['_id'])
+                asteroid = Asteroid(**cached)
+                _remember_parsed(key, asteroid)
+        else:
+            _parsed_cache.move_to_end(key)
+        if asteroid is not None:
+            return asteroid, False
+    
+    neo_data = await nasa_neo_service.get_neo_by_id(nasa_id)
+    return nasa_neo_service.parse_neo_to_asteroid(neo_data), True
+
+def _remember_parsed(key: tuple, asteroid: Asteroid):
+    """Store a parsed asteroid, evicting the least recently used one when full"""
+    _parsed_cache[key] = asteroid
+    if len(_parsed_cache) > PARSED_CACHE_SIZE:
+        _parsed_cache.popitem(last=False)
+
+def _json_response(body: bytes) -> Response:
+    """Return pre-rendered JSON as-is"""
+    return Response(content=body, media_type="application/json")
+
+def _cache_response(cache: TTLCache, key: str, content) -> Response:
+    """Render content to JSON once and keep it for later requests"""
+    body = orjson.dumps(content)
+    cache[key] = body
+    return _json_response(body)
+
+def _asteroid_upsert(asteroid: Asteroid, include_approaches: bool = True) -> UpdateOne:
+    """Build the cache upsert for an asteroid"""
+    # Skip the raw payload; when approaches weren't parsed, leave any stored ones untouched
+    exclude = {"nasa_data"} if include_approaches else {"nasa_data", "close_approaches"}
+    asteroid_dict = asteroid.model_dump(exclude=exclude)
+    asteroid_dict.pop('_id', None)  # Remove the generated ID for upsert
+    return UpdateOne({"nasa_id": asteroid.nasa_id}, {"$set": asteroid_dict, "$unset": {"nasa_data": ""}}, upsert=True)
 
 def _get_asteroid_description(nasa_id: str) -> str:
     """Get description for famous asteroids"""
@@ -1,32 +1,34 @@
 from fastapi import FastAPI, APIRouter
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List
 import uuid
+import orjson
 from datetime import datetime
 
 # Import new routers
 from routers import nasa_neo, enhanced_simulation
+from services.nasa_neo_service import nasa_neo_service
+
+# Shared MongoDB connection
+from database import client, db
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
 # Create the main app without a prefix
 app = FastAPI(
     title="Asteroid Impact Simulator API",
     description="Enhanced asteroid impact simulation using real NASA NEO data",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
+app.state.db = db
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -57,15 +59,24 @@ async def root():
 
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
+    status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    _ = await db.status_checks.insert_one(status_obj.model_dump())
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+    # Stream the checks in batches rather than loading up to 1000 at once
+    cursor = db.status_checks.find({}, projection={"_id": 0}, limit=1000, batch_size=200)
+    
+    async def stream_status_checks():
+        separator = b"["
+        async for status_check in cursor:
+            yield separator + orjson.dumps(status_check)
+            separator = b","
+        yield b"]" if separator == b"," else b"[]"
+    
+    return StreamingResponse(stream_status_checks(), media_type="application/json")
 
 # Health check endpoint
 @api_router.get("/health")
@@ -128,18 +139,34 @@ async def startup_event():
         await db.asteroids.create_index("nasa_id", unique=True)
         await db.asteroids.create_index("potentially_hazardous")
         await db.asteroids.create_index("estimated_diameter_km")
+        await db.asteroids.create_index([("is_active", 1), ("estimated_diameter_km", 1)])
+        await db.asteroids.create_index([("is_active", 1), ("potentially_hazardous", 1)])
         await db.simulations.create_index("created_at")
-        await db.simulations.create_index("nasa_enhanced")
+        await db.simulations.create_index([("nasa_enhanced", 1), ("created_at", -1)])
+        await db.simulations.create_index([("tags", 1), ("created_at", -1)])
+        await db.simulations.create_index("parameters.asteroid_nasa_id")
         
         logger.info("✅ Database indexes created")
         
     except Exception as e:
         logger.error(f"❌ Database connection failed: {str(e)}")
     
+    # Open the long-lived NASA API session
+    await nasa_neo_service.start()
+    
+    # Compile the physics kernels up front, then start the worker pool
+    await enhanced_simulation.warm_physics_pool()
+    enhanced_simulation.start_physics_pool()
+    logger.info("✅ Physics worker pool ready")
+    
     logger.info("🌌 Asteroid Impact Simulator API ready!")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     logger.info("🛑 Shutting down Asteroid Impact Simulator API...")
     client.close()
-    logger.info("✅ Database connection closed")
\ No newline at end of file
+    logger.info("✅ Database connection closed")
+    await nasa_neo_service.close()
+    logger.info("✅ NASA API session closed")
+    enhanced_simulation.stop_physics_pool()
+    logger.info("✅ Physics worker pool stopped")
\ No newline at end of file
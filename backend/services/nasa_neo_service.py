@@ -1,7 +1,12 @@
 import os
+import heapq
+import math
+import operator
+import random
 import aiohttp
 import asyncio
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 from models.asteroid import Asteroid, CloseApproach, OrbitalElements, DiameterEstimate, AsteroidFilter
@@ -14,51 +19,101 @@ logger = logging.getLogger(__name__)
 ROOT_DIR = Path(__file__).parent.parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Estimated bulk density by composition
+COMPOSITION_DENSITIES = {
+    "rocky": 2600,  # kg/m³
+    "iron": 7800,   # kg/m³
+    "icy": 1000,    # kg/m³
+    "stony": 3500   # kg/m³
+}
+
 class NASANEOService:
     """Service for integrating with NASA NEO (Near Earth Object) API"""
     
+    # Cap on in-flight NASA requests so concurrent fan-outs stay clear of
+    # the API rate limit and the connector pool
+    MAX_CONCURRENT_REQUESTS = 10
+    
+    # Timeouts and these transient statuses are retried with jittered backoff
+    MAX_ATTEMPTS = 4
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
     def __init__(self):
         self.api_key = os.environ.get('NASA_API_KEY')
         self.base_url = os.environ.get('NASA_NEO_BASE_URL', 'https://api.nasa.gov/neo/rest/v1/')
         self.session: Optional[aiohttp.ClientSession] = None
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
         
         if not self.api_key:
             logger.warning("NASA API key not found. Real NEO data will be unavailable.")
     
+    async def start(self):
+        """Open the shared HTTP session, reused across requests so connections stay alive"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=75)
+            )
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+    
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        await self.start()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The session is long-lived and closed on application shutdown
+        pass
     
     async def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Make authenticated request to NASA NEO API"""
-        if not self.session:
-            raise RuntimeError("Service not properly initialized. Use async context manager.")
-            
         if not self.api_key:
             raise RuntimeError("NASA API key not configured")
         
+        await self.start()
         url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
         
         request_params = {"api_key": self.api_key}
         if params:
             request_params.update(params)
         
-        try:
-            async with self.session.get(url, params=request_params, timeout=30) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return data
-                
-        except aiohttp.ClientTimeout:
-            logger.error(f"NASA API request timeout: {url}")
-            raise RuntimeError("NASA API request timed out")
-        except aiohttp.ClientError as e:
-            logger.error(f"NASA API request failed: {url} - {str(e)}")
-            raise RuntimeError(f"NASA API request failed: {str(e)}")
+        for attempt in range(self.MAX_ATTEMPTS):
+            retries_left = attempt < self.MAX_ATTEMPTS - 1
+            try:
+                async with self._request_semaphore:
+                    async with self.session.get(url, params=request_params, timeout=30) as response:
+                        response.raise_for_status()
+                        data = orjson.loads(await response.read())
+                        return data
+                    
+            except asyncio.TimeoutError:
+                if retries_left:
+                    logger.warning(f"NASA API request timeout, retrying: {url}")
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                logger.error(f"NASA API request timeout: {url}")
+                raise RuntimeError("NASA API request timed out")
+            except aiohttp.ClientResponseError as e:
+                if retries_left and e.status in self.RETRY_STATUSES:
+                    logger.warning(f"NASA API returned {e.status}, retrying: {url}")
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                logger.error(f"NASA API request failed: {url} - {str(e)}")
+                raise RuntimeError(f"NASA API request failed: {str(e)}")
+            except aiohttp.ClientError as e:
+                logger.error(f"NASA API request failed: {url} - {str(e)}")
+                raise RuntimeError(f"NASA API request failed: {str(e)}")
+            except orjson.JSONDecodeError as e:
+                logger.error(f"NASA API returned invalid JSON: {url} - {str(e)}")
+                raise RuntimeError(f"NASA API returned invalid JSON: {str(e)}")
+    
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Exponential backoff with jitter so retries don't arrive in lockstep"""
+        return 0.5 * 2 ** attempt + random.random() * 0.25
     
     async def get_neo_browse(self, limit: int = 20, page: int = 0) -> Dict[str, Any]:
         """Browse NEO database"""
@@ -83,36 +138,37 @@ class NASANEOService:
     async def search_asteroids(self, filters: AsteroidFilter) -> List[Dict[str, Any]]:
         """Search and filter asteroids from NASA NEO database"""
         all_asteroids = []
+        
+        # Request as many pages at once as an unfiltered search would need,
+        # then keep going in batches of that size while filters drop results
+        batch_size = math.ceil(filters.limit / 20)
         page = 0
-        collected = 0
         
-        while collected < filters.limit:
-            try:
-                # Get page of results
-                browse_data = await self.get_neo_browse(limit=20, page=page)
-                neos = browse_data.get('near_earth_objects', [])
+        while len(all_asteroids) < filters.limit and page <= 50:  # Reasonable limit
+            pages = range(page, min(page + batch_size, 51))
+            browse_pages = await asyncio.gather(
+                *(self.get_neo_browse(limit=20, page=p) for p in pages),
+                return_exceptions=True
+            )
+            
+            for p, browse_data in zip(pages, browse_pages):
+                if isinstance(browse_data, Exception):
+                    logger.error(f"Error fetching NEO page {p}: {str(browse_data)}")
+                    return all_asteroids
                 
+                neos = browse_data.get('near_earth_objects', [])
                 if not neos:
-                    break  # No more results
+                    return all_asteroids  # No more results
                 
                 # Apply filters
                 for neo in neos:
-                    if collected >= filters.limit:
-                        break
-                        
+                    if len(all_asteroids) >= filters.limit:
+                        return all_asteroids
+                    
                     if self._matches_filter(neo, filters):
                         all_asteroids.append(neo)
-                        collected += 1
-                
-                page += 1
-                
-                # Prevent infinite loops
-                if page > 50:  # Reasonable limit
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error fetching NEO page {page}: {str(e)}")
-                break
+            
+            page = pages.stop
         
         return all_asteroids
     
@@ -149,7 +205,17 @@ class NASANEOService:
             return (min_diameter + max_diameter) / 2
         return None
     
-    def parse_neo_to_asteroid(self, neo_data: Dict[str, Any]) -> Asteroid:
+    def parse_neos(self, neo_data_list: List[Dict[str, Any]], include_approaches: bool = True) -> List[Asteroid]:
+        """Parse a batch of NEOs, skipping any that fail; CPU-bound, so callers run it in a thread"""
+        asteroids = []
+        for neo_data in neo_data_list:
+            try:
+                asteroids.append(self.parse_neo_to_asteroid(neo_data, include_approaches))
+            except Exception as e:
+                logger.warning(f"Failed to parse NEO data: {str(e)}")
+        return asteroids
+    
+    def parse_neo_to_asteroid(self, neo_data: Dict[str, Any], include_approaches: bool = True) -> Asteroid:
         """Convert NASA NEO data to our Asteroid model"""
         
         # Extract diameter estimates
@@ -173,9 +239,9 @@ class NASANEOService:
                 aphelion_distance_au=orbital_data.get('aphelion_distance')
             )
         
-        # Extract close approach data
+        # Extract close approach data (list views skip it; some NEOs have hundreds)
         close_approaches = []
-        for approach in neo_data.get('close_approach_data', []):
+        for approach in neo_data.get('close_approach_data', []) if include_approaches else ():
             close_approaches.append(CloseApproach(
                 date=approach.get('close_approach_date'),
                 velocity_kms=float(approach.get('relative_velocity', {}).get('kilometers_per_second', 0)),
@@ -216,17 +282,13 @@ class NASANEOService:
         # Most NEOs are rocky/stony
         return "rocky"
     
-    def _estimate_density(self, composition: str) -> float:
+    @staticmethod
+    def _estimate_density(composition: str) -> float:
         """Get estimated density based on composition"""
-        density_map = {
-            "rocky": 2600,  # kg/m³
-            "iron": 7800,   # kg/m³
-            "icy": 1000,    # kg/m³
-            "stony": 3500   # kg/m³
-        }
-        return density_map.get(composition, 2600)
+        return COMPOSITION_DENSITIES.get(composition, 2600)
     
-    def _classify_neo_type(self, orbital_elements: Optional[OrbitalElements]) -> Optional[str]:
+    @staticmethod
+    def _classify_neo_type(orbital_elements: Optional[OrbitalElements]) -> Optional[str]:
         """Classify NEO type based on orbital elements"""
         if not orbital_elements or not orbital_elements.semi_major_axis_au:
             return None
@@ -246,27 +308,48 @@ class NASANEOService:
         else:
             return "Other"
     
-    async def get_recent_close_approaches(self, days_ahead: int = 30) -> List[Dict[str, Any]]:
-        """Get asteroids with close approaches in the next N days"""
-        start_date = datetime.now().strftime('%Y-%m-%d')
-        end_date = (datetime.now() + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+    async def get_recent_close_approaches(
+        self, days_ahead: int = 30, limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get the closest asteroids approaching in the next N days, and how many were found"""
+        start_date = datetime.now().date()
+        end_date = start_date + timedelta(days=days_ahead)
+        
+        # The feed covers at most 7 days per request, so split the range into
+        # weekly windows and fetch them concurrently
+        windows = []
+        window_start = start_date
+        while window_start <= end_date:
+            window_end = min(window_start + timedelta(days=6), end_date)
+            windows.append((window_start, window_end))
+            window_start = window_end + timedelta(days=1)
         
-        feed_data = await self.get_neo_feed(start_date, end_date)
+        feeds = await asyncio.gather(*(
+            self.get_neo_feed(window_start.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d'))
+            for window_start, window_end in windows
+        ))
         
         approaching_asteroids = []
-        for date, neos in feed_data.get('near_earth_objects', {}).items():
-            for neo in neos:
-                # Add approach date to neo data
-                neo['approach_date'] = date
-                approaching_asteroids.append(neo)
+        for feed_data in feeds:
+            for date, neos in feed_data.get('near_earth_objects', {}).items():
+                for neo in neos:
+                    # Add approach date and closest miss distance to neo data
+                    neo['approach_date'] = date
+                    neo['_min_miss_km'] = min(
+                        (float(app.get('miss_distance', {}).get('kilometers', float('inf')))
+                         for app in neo.get('close_approach_data', ())),
+                        default=float('inf')
+                    )
+                    approaching_asteroids.append(neo)
         
-        # Sort by closest approach
-        approaching_asteroids.sort(key=lambda x: (
-            min([float(app.get('miss_distance', {}).get('kilometers', float('inf'))) 
-                 for app in x.get('close_approach_data', [{}])])
-        ))
+        # Closest approaches first; only the requested number are kept sorted
+        by_miss_distance = operator.itemgetter('_min_miss_km')
+        if limit is None:
+            closest = sorted(approaching_asteroids, key=by_miss_distance)
+        else:
+            closest = heapq.nsmallest(limit, approaching_asteroids, key=by_miss_distance)
         
-        return approaching_asteroids
+        return closest, len(approaching_asteroids)
 
 # Singleton instance
 nasa_neo_service = NASANEOService()
\ No newline at end of file
@@ -0,0 +1,22 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from cachetools import TTLCache
+
+# Rendered JSON for the NEO read endpoints. Asteroid data only changes when it
+# is fetched or synced from NASA, and every writer calls asteroids_changed.
+asteroids_cache = TTLCache(maxsize=256, ttl=300)
+asteroid_cache = TTLCache(maxsize=1024, ttl=300)
+featured_cache = TTLCache(maxsize=1, ttl=3600)
+stats_cache = TTLCache(maxsize=1, ttl=60)
+
+# Documents in db.neo_views derived from the asteroid cache
+NEO_VIEW_IDS = ["stats", "featured"]
+
+def invalidate_neo_caches():
+    """Drop rendered responses after the asteroid cache changes"""
+    for cache in (asteroids_cache, asteroid_cache, featured_cache, stats_cache):
+        cache.clear()
+
+async def asteroids_changed(db: AsyncIOMotorDatabase):
+    """Drop cached responses and the precomputed views after asteroids are written"""
+    invalidate_neo_caches()
+    await db.neo_views.delete_many({"_id": {"$in": NEO_VIEW_IDS}})
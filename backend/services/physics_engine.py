@@ -1,20 +1,95 @@
 import math
-from typing import Dict, Any, Optional
+import bisect
+import numpy as np
+from typing import Dict, List
+from dataclasses import dataclass, fields
 from models.asteroid import Asteroid, OrbitalElements
 from models.simulation import ImpactParameters, ImpactResults, ImpactMetric
+from services import physics_kernels
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds of the minor, moderate and severe levels for each metric;
+# values above the last bound are catastrophic
+SEVERITY_THRESHOLDS = {
+    "crater": (2, 10, 20),
+    "energy": (1000, 10000, 100000),
+    "temperature": (5000, 20000, 50000),
+    "fireball": (10, 50, 100),
+    "shockwave": (200, 1000, 2000),
+    "debris": (1000, 2500, 5000),
+    "seismic": (5, 7, 8),
+    "dust": (1, 10, 50),
+    "casualty": (100000, 1000000, 5000000),
+    "infrastructure": (100, 500, 1000),
+    "economic": (100, 1000, 5000),
+    "refugee": (1000000, 5000000, 20000000),
+}
+SEVERITY_LEVELS = ("minor", "moderate", "severe", "catastrophic")
+
+# Impact timeline; the t1, t3 and t5 placeholders keep the event order and
+# are filled in per scenario
+TIMELINE_TEMPLATE = {
+    "t0": {"time": "0 seconds", "event": "Initial impact and crater excavation begins"},
+    "t1": None,
+    "t2": {"time": "10 seconds", "event": "Thermal radiation pulse at maximum intensity"},
+    "t3": None,
+    "t4": {"time": "5 minutes", "event": "Ballistic ejecta begins falling back to Earth"},
+    "t5": None,
+    "t6": {"time": "2 hours", "event": "Atmospheric dust begins affecting regional weather"},
+    "t7": {"time": "24 hours", "event": "Global atmospheric effects become apparent"},
+    "t8": {"time": "1 week", "event": "Long-term environmental and climate impacts emerge"}
+}
+
+def _severity(metric: str, value: float) -> str:
+    """Classify a value against its metric's severity thresholds"""
+    # bisect_left keeps values equal to a bound in the lower level
+    return SEVERITY_LEVELS[bisect.bisect_left(SEVERITY_THRESHOLDS[metric], value)]
+
+@dataclass(slots=True)
+class _ImpactEffects:
+    """Metric groups of one scenario, passed straight into ImpactResults"""
+    immediate: Dict[str, ImpactMetric]
+    environmental: Dict[str, ImpactMetric]
+    human_impact: Dict[str, ImpactMetric]
+    timeline: Dict[str, Dict[str, str]]
+
+@dataclass
+class BulkImpactResults:
+    """Impact metrics for many scenarios, stored as one array per metric"""
+    energy_mt: np.ndarray
+    velocity_kms: np.ndarray
+    diameter_m: np.ndarray
+    crater_diameter_m: np.ndarray
+    fireball_radius_km: np.ndarray
+    peak_temperature: np.ndarray
+    shockwave_radius_km: np.ndarray
+    seismic_magnitude: np.ndarray
+    debris_radius_km: np.ndarray
+    atmospheric_dust_tons: np.ndarray
+    casualties: np.ndarray
+    infrastructure_damage_km: np.ndarray
+    economic_loss_billion: np.ndarray
+    refugees: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.energy_mt)
+    
+    def row(self, i: int) -> tuple:
+        """One scenario's values, in field order"""
+        return tuple(float(getattr(self, field.name)[i]) for field in fields(self))
+
 class EnhancedPhysicsEngine:
     """Enhanced physics calculations using real orbital mechanics and NASA data"""
     
     # Physical constants
     EARTH_ESCAPE_VELOCITY = 11.2  # km/s
-    EARTH_RADIUS = 6371  # km
+    EARTH_ESCAPE_VELOCITY_SQ = EARTH_ESCAPE_VELOCITY ** 2
     EARTH_MASS = 5.972e24  # kg
     G = 6.67430e-11  # m³/kg/s²
     AU = 1.496e11  # meters
+    GM_SUN = 1.327e20  # m³/s², solar mass
     
     # Material properties
     MATERIAL_DENSITIES = {
@@ -24,58 +99,115 @@ class EnhancedPhysicsEngine:
         "stony": 3500    # kg/m³
     }
     
-    def __init__(self):
-        self.calculation_metadata = {}
-    
     def calculate_impact_scenario(self, asteroid: Asteroid, parameters: ImpactParameters) -> ImpactResults:
         """Main calculation method using enhanced physics and real NASA data"""
         
-        logger.info(f"Calculating impact for NASA NEO {asteroid.nasa_id}: {asteroid.name}")
+        logger.info("Calculating impact for NASA NEO %s: %s", asteroid.nasa_id, asteroid.name)
         
         # Calculate enhanced impact velocity using orbital mechanics
         impact_velocity = self._calculate_impact_velocity(asteroid, parameters)
         
         # Get asteroid physical properties
-        mass_kg = self._calculate_asteroid_mass(asteroid)
-        density = asteroid.density_kg_m3 or self.MATERIAL_DENSITIES[asteroid.composition_type]
         diameter_m = (asteroid.estimated_diameter_km or 1.0) * 1000
+        density = self._resolve_density(asteroid)
+        mass_kg = float(physics_kernels.sphere_mass(float(diameter_m), float(density)))
         
         # Calculate kinetic energy
-        kinetic_energy_joules = 0.5 * mass_kg * (impact_velocity * 1000) ** 2
-        energy_megatons = kinetic_energy_joules / (4.184e15)  # Convert to megatons TNT
+        energy_megatons = float(physics_kernels.energy_megatons(mass_kg, float(impact_velocity)))
         
         # Enhanced impact calculations
         results = self._calculate_comprehensive_effects(
-            energy_megatons=energy_megatons,
-            mass_kg=mass_kg,
-            velocity_kms=impact_velocity,
-            diameter_m=diameter_m,
-            density=density,
-            impact_angle=parameters.impact_angle_deg,
-            target_density=parameters.target_density_kg_m3,
-            location=parameters.impact_location
+            energy_megatons, impact_velocity, diameter_m,
+            parameters.impact_angle_deg, parameters.target_density_kg_m3
         )
         
-        # Store calculation metadata
-        self.calculation_metadata = {
-            "asteroid_source": "nasa_neo",
-            "calculation_method": "enhanced_physics",
-            "impact_velocity_used": impact_velocity,
-            "asteroid_mass_kg": mass_kg,
-            "kinetic_energy_mt": energy_megatons,
-            "nasa_asteroid_id": asteroid.nasa_id
-        }
-        
         return ImpactResults(
-            immediate=results["immediate"],
-            environmental=results["environmental"],
-            human_impact=results["human_impact"],
-            timeline=results["timeline"],
+            immediate=results.immediate,
+            environmental=results.environmental,
+            human_impact=results.human_impact,
+            timeline=results.timeline,
             asteroid_source="nasa_neo",
             calculation_method="enhanced_physics",
             confidence_level=0.85  # Higher confidence with real NASA data
         )
     
+    def calculate_impact_scenario_batch(
+        self,
+        asteroids: List[Asteroid],
+        parameters: List[ImpactParameters]
+    ) -> List[ImpactResults]:
+        """Vectorized calculate_impact_scenario for many asteroid/parameter pairs"""
+        
+        columns = self.calculate_impact_columns(asteroids, parameters)
+        
+        # Only the final model construction is per scenario
+        results = []
+        for i in range(len(columns)):
+            scenario = self._build_effects(*columns.row(i))
+            results.append(ImpactResults(
+                immediate=scenario.immediate,
+                environmental=scenario.environmental,
+                human_impact=scenario.human_impact,
+                timeline=scenario.timeline,
+                asteroid_source="nasa_neo",
+                calculation_method="enhanced_physics",
+                confidence_level=0.85
+            ))
+        
+        return results
+    
+    def calculate_impact_columns(
+        self,
+        asteroids: List[Asteroid],
+        parameters: List[ImpactParameters]
+    ) -> "BulkImpactResults":
+        """Impact metrics for many asteroid/parameter pairs as one array per metric"""
+        
+        if len(asteroids) != len(parameters):
+            raise ValueError("asteroids and parameters must have the same length")
+        
+        logger.info("Calculating %d impact scenarios in batch", len(asteroids))
+        
+        # Gather per-scenario inputs into arrays; missing values become NaN
+        explicit_velocity_kms = np.array([
+            params.impact_velocity_kms or np.nan for params in parameters
+        ], dtype=np.float64)
+        semi_major_axis_au = np.array([
+            (asteroid.orbital_elements and asteroid.orbital_elements.semi_major_axis_au) or np.nan
+            for asteroid in asteroids
+        ], dtype=np.float64)
+        diameter_m = np.array([
+            (asteroid.estimated_diameter_km or 1.0) * 1000 for asteroid in asteroids
+        ], dtype=np.float64)
+        density = np.array([self._resolve_density(asteroid) for asteroid in asteroids], dtype=np.float64)
+        impact_angle = np.array([params.impact_angle_deg for params in parameters], dtype=np.float64)
+        target_density = np.array([params.target_density_kg_m3 for params in parameters], dtype=np.float64)
+        
+        # Impact velocity: explicit, else from the orbit, else the typical NEO velocity
+        orbital_velocity_kms = np.sqrt(self.GM_SUN / (semi_major_axis_au * self.AU)) / 1000
+        velocity_kms = np.where(
+            np.isnan(explicit_velocity_kms),
+            np.where(
+                np.isnan(semi_major_axis_au),
+                20.0,
+                np.sqrt(orbital_velocity_kms * orbital_velocity_kms + self.EARTH_ESCAPE_VELOCITY_SQ)
+            ),
+            explicit_velocity_kms
+        )
+        
+        # Evaluate every formula once across all scenarios
+        mass_kg = physics_kernels.sphere_mass(diameter_m, density)
+        energy_megatons = physics_kernels.energy_megatons(mass_kg, velocity_kms)
+        effects = physics_kernels.impact_effects_batch(
+            energy_megatons, velocity_kms, diameter_m, impact_angle, target_density
+        )
+        
+        return BulkImpactResults(energy_megatons, velocity_kms, diameter_m, *effects)
+    
+    def _resolve_density(self, asteroid: Asteroid) -> float:
+        """Measured density, else the typical density of the asteroid's composition"""
+        return asteroid.density_kg_m3 or self.MATERIAL_DENSITIES.get(asteroid.composition_type, 2600)
+    
     def _calculate_impact_velocity(self, asteroid: Asteroid, parameters: ImpactParameters) -> float:
         """Calculate realistic impact velocity using orbital mechanics"""
         
@@ -85,17 +217,24 @@ class EnhancedPhysicsEngine:
         
         # Use orbital data if available
         if asteroid.orbital_elements and asteroid.orbital_elements.semi_major_axis_au:
-            orbital_velocity = self._calculate_orbital_velocity(asteroid.orbital_elements)
-            
-            # Impact velocity = √(v_orbital² + v_escape²)
-            impact_velocity = math.sqrt(orbital_velocity**2 + self.EARTH_ESCAPE_VELOCITY**2)
-            
-            logger.info(f"Calculated orbital velocity: {orbital_velocity:.2f} km/s, impact velocity: {impact_velocity:.2f} km/s")
-            return impact_velocity
+            return self._calculate_orbital_impact_velocity(asteroid.orbital_elements)
         
         # Fallback to statistical average for NEOs
         return 20.0  # km/s - typical NEO impact velocity
     
+    def _calculate_orbital_impact_velocity(self, orbital_elements: OrbitalElements) -> float:
+        """Impact velocity of an asteroid arriving on its orbit"""
+        orbital_velocity = self._calculate_orbital_velocity(orbital_elements)
+        
+        # Impact velocity = √(v_orbital² + v_escape²)
+        impact_velocity = math.sqrt(orbital_velocity * orbital_velocity + self.EARTH_ESCAPE_VELOCITY_SQ)
+        
+        logger.info(
+            "Calculated orbital velocity: %.2f km/s, impact velocity: %.2f km/s",
+            orbital_velocity, impact_velocity
+        )
+        return impact_velocity
+    
     def _calculate_orbital_velocity(self, orbital_elements: OrbitalElements) -> float:
         """Calculate orbital velocity from semi-major axis"""
         if not orbital_elements.semi_major_axis_au:
@@ -105,322 +244,196 @@ class EnhancedPhysicsEngine:
         # Approximation using perihelion distance
         a_meters = orbital_elements.semi_major_axis_au * self.AU
         
-        # Solar mass
-        GM_sun = 1.327e20  # m³/s²
-        
         # Approximate velocity at 1 AU
-        velocity_ms = math.sqrt(GM_sun / a_meters)
+        velocity_ms = math.sqrt(self.GM_SUN / a_meters)
         velocity_kms = velocity_ms / 1000
         
         return velocity_kms
     
-    def _calculate_asteroid_mass(self, asteroid: Asteroid) -> float:
-        """Calculate asteroid mass from size and density estimates"""
-        diameter_km = asteroid.estimated_diameter_km or 1.0
-        diameter_m = diameter_km * 1000
-        
-        # Volume of sphere
-        radius_m = diameter_m / 2
-        volume_m3 = (4/3) * math.pi * radius_m**3
-        
-        # Mass = volume × density
-        density = asteroid.density_kg_m3 or self.MATERIAL_DENSITIES.get(asteroid.composition_type, 2600)
-        mass_kg = volume_m3 * density
-        
-        return mass_kg
-    
-    def _calculate_comprehensive_effects(self, **kwargs) -> Dict[str, Dict[str, ImpactMetric]]:
+    def _calculate_comprehensive_effects(
+        self, energy_mt: float, velocity_kms: float, diameter_m: float,
+        impact_angle: float, target_density: float
+    ) -> "_ImpactEffects":
         """Calculate comprehensive impact effects using enhanced physics"""
         
-        energy_mt = kwargs["energy_megatons"]
-        velocity_kms = kwargs["velocity_kms"]
-        diameter_m = kwargs["diameter_m"]
-        density = kwargs["density"]
-        angle_deg = kwargs["impact_angle"]
-        target_density = kwargs["target_density"]
-        
-        # Enhanced crater calculation (Melosh scaling laws)
-        crater_diameter_m = self._calculate_crater_diameter(
-            energy_mt, diameter_m, velocity_kms, density, target_density, angle_deg
-        )
-        
-        # Enhanced thermal effects
-        fireball_radius_km, peak_temperature = self._calculate_thermal_effects(energy_mt, velocity_kms)
-        
-        # Enhanced shockwave calculation
-        shockwave_radius_km = self._calculate_shockwave_radius(energy_mt, angle_deg)
-        
-        # Seismic effects
-        seismic_magnitude = self._calculate_seismic_magnitude(energy_mt)
-        
-        # Atmospheric and ejecta effects
-        debris_radius_km = self._calculate_debris_field(energy_mt, angle_deg)
-        atmospheric_dust_tons = self._calculate_atmospheric_dust(energy_mt, diameter_m)
+        effects = physics_kernels.impact_effects(energy_mt, velocity_kms, diameter_m, impact_angle, target_density)
+        return self._build_effects(energy_mt, velocity_kms, diameter_m, *(float(value) for value in effects))
+    
+    def _build_effects(
+        self, energy_mt, velocity_kms, diameter_m, crater_diameter_m, fireball_radius_km,
+        peak_temperature, shockwave_radius_km, seismic_magnitude, debris_radius_km,
+        atmospheric_dust_tons, casualties, infrastructure_damage_km, economic_loss_billion, refugees
+    ) -> "_ImpactEffects":
+        """Assemble impact metrics for one scenario"""
         
-        # Human impact calculations
-        casualties = self._estimate_casualties(shockwave_radius_km, fireball_radius_km)
-        infrastructure_damage_km = shockwave_radius_km * 1.5
-        economic_loss_billion = energy_mt * 0.1  # Simplified economic model
-        refugees = self._estimate_refugees(debris_radius_km)
+        # Derived and formatted values shared by several metrics and descriptions
+        crater_km = crater_diameter_m / 1000
+        dust_billion_tons = atmospheric_dust_tons / 1e9
+        crater_text = f"{crater_km:.1f}"
+        energy_text = f"{energy_mt:,.0f}"
+        velocity_text = f"{velocity_kms:.1f}"
+        fireball_text = f"{fireball_radius_km:.1f}"
+        seismic_text = f"{seismic_magnitude:.1f}"
         
-        return {
-            "immediate": {
+        return _ImpactEffects(
+            immediate={
                 "craterDiameter": ImpactMetric(
-                    value=f"{crater_diameter_m/1000:.1f}",
+                    value=crater_text,
+                    value_numeric=crater_km,
                     unit="km",
-                    severity=self._get_crater_severity(crater_diameter_m/1000),
+                    severity=self._get_crater_severity(crater_km),
                     description=f"Impact crater formed by {diameter_m}m asteroid, with rim heights reaching {crater_diameter_m*0.05:.0f}m above ground level.",
-                    progress=min(100, (crater_diameter_m/1000 / 50) * 100),
+                    progress=min(100, crater_km * 2),  # 100% at 50 km
                     scientific_basis="Melosh-Ivanov scaling laws for complex craters"
                 ),
                 "energy": ImpactMetric(
-                    value=f"{energy_mt:,.0f}",
+                    value=energy_text,
+                    value_numeric=energy_mt,
                     unit="megatons TNT",
                     severity=self._get_energy_severity(energy_mt),
-                    description=f"Total kinetic energy from {velocity_kms:.1f} km/s impact, calculated using enhanced orbital mechanics.",
-                    progress=min(100, (energy_mt / 1000000) * 100),
+                    description=f"Total kinetic energy from {velocity_text} km/s impact, calculated using enhanced orbital mechanics.",
+                    progress=min(100, energy_mt / 10000),  # 100% at 1,000,000 MT
                     scientific_basis="Real orbital velocity + Earth escape velocity"
                 ),
                 "temperature": ImpactMetric(
                     value=f"{peak_temperature:,.0f}",
+                    value_numeric=peak_temperature,
                     unit="°C",
                     severity=self._get_temperature_severity(peak_temperature),
-                    description=f"Peak temperature at impact site from {velocity_kms:.1f} km/s collision, creating superheated plasma.",
-                    progress=min(100, (peak_temperature / 100000) * 100),
+                    description=f"Peak temperature at impact site from {velocity_text} km/s collision, creating superheated plasma.",
+                    progress=min(100, peak_temperature / 1000),  # 100% at 100,000 °C
                     scientific_basis="Shock physics and equation of state calculations"
                 ),
                 "fireballRadius": ImpactMetric(
-                    value=f"{fireball_radius_km:.1f}",
+                    value=fireball_text,
+                    value_numeric=fireball_radius_km,
                     unit="km",
                     severity=self._get_fireball_severity(fireball_radius_km),
-                    description=f"Radius of superheated fireball causing thermal radiation burns and igniting fires.",
-                    progress=min(100, (fireball_radius_km / 200) * 100),
+                    description="Radius of superheated fireball causing thermal radiation burns and igniting fires.",
+                    progress=min(100, fireball_radius_km / 2),  # 100% at 200 km
                     scientific_basis="Sedov-Taylor blast wave solution"
                 )
             },
-            "environmental": {
+            environmental={
                 "shockwaveRadius": ImpactMetric(
                     value=f"{shockwave_radius_km:.1f}",
+                    value_numeric=shockwave_radius_km,
                     unit="km",
                     severity=self._get_shockwave_severity(shockwave_radius_km),
-                    description=f"Radius of destructive shockwave from {energy_mt:,.0f} MT explosion, causing building collapse.",
-                    progress=min(100, (shockwave_radius_km / 3000) * 100),
+                    description=f"Radius of destructive shockwave from {energy_text} MT explosion, causing building collapse.",
+                    progress=min(100, shockwave_radius_km / 30),  # 100% at 3000 km
                     scientific_basis="Atmospheric blast wave propagation models"
                 ),
                 "debrisFieldRadius": ImpactMetric(
                     value=f"{debris_radius_km:.1f}",
+                    value_numeric=debris_radius_km,
                     unit="km",
                     severity=self._get_debris_severity(debris_radius_km),
-                    description=f"Area covered by ejected debris and impact fragments from {crater_diameter_m/1000:.1f}km crater.",
-                    progress=min(100, (debris_radius_km / 8000) * 100),
+                    description=f"Area covered by ejected debris and impact fragments from {crater_text}km crater.",
+                    progress=min(100, debris_radius_km / 80),  # 100% at 8000 km
                     scientific_basis="Ballistic trajectory modeling of ejecta"
                 ),
                 "seismicMagnitude": ImpactMetric(
-                    value=f"{seismic_magnitude:.1f}",
+                    value=seismic_text,
+                    value_numeric=seismic_magnitude,
                     unit="magnitude",
                     severity=self._get_seismic_severity(seismic_magnitude),
-                    description=f"Earthquake magnitude from {energy_mt:,.0f} MT impact, generating global seismic waves.",
-                    progress=min(100, (seismic_magnitude / 10) * 100),
+                    description=f"Earthquake magnitude from {energy_text} MT impact, generating global seismic waves.",
+                    progress=min(100, seismic_magnitude * 10),  # 100% at magnitude 10
                     scientific_basis="Energy-magnitude scaling relationships"
                 ),
                 "atmosphericDust": ImpactMetric(
-                    value=f"{atmospheric_dust_tons/1e9:.1f}",
+                    value=f"{dust_billion_tons:.1f}",
+                    value_numeric=dust_billion_tons,
                     unit="billion tons",
-                    severity=self._get_dust_severity(atmospheric_dust_tons/1e9),
+                    severity=self._get_dust_severity(dust_billion_tons),
                     description=f"Dust and debris ejected into atmosphere from {diameter_m}m asteroid impact.",
-                    progress=min(100, (atmospheric_dust_tons/1e9 / 100) * 100),
+                    progress=min(100, dust_billion_tons),  # 100% at 100 billion tons
                     scientific_basis="Impact ejecta scaling and atmospheric modeling"
                 )
             },
-            "human_impact": {
+            human_impact={
                 "casualtiesImmediate": ImpactMetric(
                     value=f"{casualties:,.0f}",
+                    value_numeric=casualties,
                     unit="estimated casualties",
                     severity=self._get_casualty_severity(casualties),
                     description=f"Immediate casualties from thermal radiation, shockwave, and debris within {shockwave_radius_km:.0f}km radius.",
-                    progress=min(100, (casualties / 10000000) * 100),
+                    progress=min(100, casualties / 100000),  # 100% at 10 million
                     scientific_basis="Population density models and lethality curves"
                 ),
                 "infrastructureDamage": ImpactMetric(
                     value=f"{infrastructure_damage_km:.0f}",
+                    value_numeric=infrastructure_damage_km,
                     unit="km radius affected",
                     severity=self._get_infrastructure_severity(infrastructure_damage_km),
-                    description=f"Radius of severe infrastructure damage including buildings, roads, and utilities.",
-                    progress=min(100, (infrastructure_damage_km / 2000) * 100),
+                    description="Radius of severe infrastructure damage including buildings, roads, and utilities.",
+                    progress=min(100, infrastructure_damage_km / 20),  # 100% at 2000 km
                     scientific_basis="Engineering failure analysis and overpressure thresholds"
                 ),
                 "economicLoss": ImpactMetric(
                     value=f"{economic_loss_billion:,.0f}",
+                    value_numeric=economic_loss_billion,
                     unit="billion USD",
                     severity=self._get_economic_severity(economic_loss_billion),
-                    description=f"Estimated economic losses from infrastructure damage and business disruption.",
-                    progress=min(100, (economic_loss_billion / 10000) * 100),
+                    description="Estimated economic losses from infrastructure damage and business disruption.",
+                    progress=min(100, economic_loss_billion / 100),  # 100% at 10,000 billion USD
                     scientific_basis="Disaster economics and regional GDP impact models"
                 ),
                 "refugeePopulation": ImpactMetric(
                     value=f"{refugees:,.0f}",
+                    value_numeric=refugees,
                     unit="displaced persons",
                     severity=self._get_refugee_severity(refugees),
                     description=f"Population requiring evacuation due to impact effects across {debris_radius_km:.0f}km radius.",
-                    progress=min(100, (refugees / 50000000) * 100),
+                    progress=min(100, refugees / 500000),  # 100% at 50 million
                     scientific_basis="Evacuation zone modeling and population displacement studies"
                 )
             },
-            "timeline": {
-                "t0": {"time": "0 seconds", "event": "Initial impact and crater excavation begins"},
-                "t1": {"time": "1 second", "event": f"Fireball reaches {fireball_radius_km:.1f}km radius"},
-                "t2": {"time": "10 seconds", "event": "Thermal radiation pulse at maximum intensity"},
+            timeline={
+                **TIMELINE_TEMPLATE,
+                "t1": {"time": "1 second", "event": f"Fireball reaches {fireball_text}km radius"},
                 "t3": {"time": f"{shockwave_radius_km/0.34:.0f} seconds", "event": "Shockwave reaches maximum extent"},
-                "t4": {"time": "5 minutes", "event": "Ballistic ejecta begins falling back to Earth"},
-                "t5": {"time": "30 minutes", "event": f"Seismic magnitude {seismic_magnitude:.1f} waves circle the globe"},
-                "t6": {"time": "2 hours", "event": "Atmospheric dust begins affecting regional weather"},
-                "t7": {"time": "24 hours", "event": "Global atmospheric effects become apparent"},
-                "t8": {"time": "1 week", "event": "Long-term environmental and climate impacts emerge"}
+                "t5": {"time": "30 minutes", "event": f"Seismic magnitude {seismic_text} waves circle the globe"}
             }
-        }
-    
-    # Enhanced calculation methods
-    def _calculate_crater_diameter(self, energy_mt, diameter_m, velocity_kms, density, target_density, angle_deg):
-        """Enhanced crater calculation using Melosh-Ivanov scaling"""
-        # Convert to SI units
-        energy_joules = energy_mt * 4.184e15
-        
-        # Angle efficiency factor
-        angle_factor = math.sin(math.radians(angle_deg))
-        
-        # Scaling law: D = K * (E/ρ_target)^0.25
-        K = 1.25  # Scaling constant for complex craters
-        crater_diameter = K * ((energy_joules * angle_factor) / target_density) ** 0.25
-        
-        return crater_diameter
-    
-    def _calculate_thermal_effects(self, energy_mt, velocity_kms):
-        """Calculate fireball and thermal effects"""
-        # Fireball radius scaling
-        fireball_radius_km = 0.5 * (energy_mt ** 0.4)
-        
-        # Peak temperature from shock heating
-        # T = (2/5) * (μ * v²) / (3 * k_B)
-        # Simplified: higher velocity = higher temperature
-        peak_temperature = min(100000, velocity_kms * 2000 + 10000)
-        
-        return fireball_radius_km, peak_temperature
-    
-    def _calculate_shockwave_radius(self, energy_mt, angle_deg):
-        """Calculate shockwave propagation"""
-        # Sedov-Taylor blast wave solution
-        angle_factor = math.sin(math.radians(angle_deg))
-        shockwave_radius = 15 * (energy_mt ** 0.33) * angle_factor
-        return shockwave_radius
-    
-    def _calculate_seismic_magnitude(self, energy_mt):
-        """Convert impact energy to seismic magnitude"""
-        # Empirical relationship: log(E) = 1.5M + 4.8
-        if energy_mt > 0:
-            magnitude = (math.log10(energy_mt * 4.184e15) - 4.8) / 1.5
-            return max(0, min(10, magnitude))
-        return 0
-    
-    def _calculate_debris_field(self, energy_mt, angle_deg):
-        """Calculate debris field radius"""
-        angle_factor = math.sin(math.radians(angle_deg))
-        debris_radius = 50 * (energy_mt ** 0.3) * angle_factor
-        return debris_radius
-    
-    def _calculate_atmospheric_dust(self, energy_mt, diameter_m):
-        """Calculate atmospheric dust injection"""
-        # Volume of excavated material
-        crater_volume = (math.pi / 6) * (diameter_m ** 3)  # Simplified
-        dust_tons = crater_volume * 2600 * 0.1  # 10% becomes atmospheric dust
-        return dust_tons
-    
-    def _estimate_casualties(self, shockwave_km, fireball_km):
-        """Estimate immediate casualties"""
-        # Simplified population density model
-        lethal_area_km2 = math.pi * (fireball_km ** 2) + 0.5 * math.pi * (shockwave_km ** 2)
-        avg_population_density = 1000  # people per km²
-        casualties = lethal_area_km2 * avg_population_density * 0.8  # 80% casualty rate
-        return casualties
-    
-    def _estimate_refugees(self, debris_km):
-        """Estimate displaced population"""
-        affected_area = math.pi * (debris_km ** 2)
-        avg_population_density = 500  # people per km²
-        refugees = affected_area * avg_population_density
-        return refugees
+        )
     
     # Severity classification methods
     def _get_crater_severity(self, diameter_km):
-        if diameter_km > 20: return "catastrophic"
-        elif diameter_km > 10: return "severe"
-        elif diameter_km > 2: return "moderate"
-        return "minor"
+        return _severity("crater", diameter_km)
     
     def _get_energy_severity(self, energy_mt):
-        if energy_mt > 100000: return "catastrophic"
-        elif energy_mt > 10000: return "severe"
-        elif energy_mt > 1000: return "moderate"
-        return "minor"
+        return _severity("energy", energy_mt)
     
     def _get_temperature_severity(self, temp):
-        if temp > 50000: return "catastrophic"
-        elif temp > 20000: return "severe"
-        elif temp > 5000: return "moderate"
-        return "minor"
+        return _severity("temperature", temp)
     
     def _get_fireball_severity(self, radius_km):
-        if radius_km > 100: return "catastrophic"
-        elif radius_km > 50: return "severe"
-        elif radius_km > 10: return "moderate"
-        return "minor"
+        return _severity("fireball", radius_km)
     
     def _get_shockwave_severity(self, radius_km):
-        if radius_km > 2000: return "catastrophic"
-        elif radius_km > 1000: return "severe"
-        elif radius_km > 200: return "moderate"
-        return "minor"
+        return _severity("shockwave", radius_km)
     
     def _get_debris_severity(self, radius_km):
-        if radius_km > 5000: return "catastrophic"
-        elif radius_km > 2500: return "severe"
-        elif radius_km > 1000: return "moderate"
-        return "minor"
+        return _severity("debris", radius_km)
     
     def _get_seismic_severity(self, magnitude):
-        if magnitude > 8: return "catastrophic"
-        elif magnitude > 7: return "severe"
-        elif magnitude > 5: return "moderate"
-        return "minor"
+        return _severity("seismic", magnitude)
     
     def _get_dust_severity(self, billion_tons):
-        if billion_tons > 50: return "catastrophic"
-        elif billion_tons > 10: return "severe"
-        elif billion_tons > 1: return "moderate"
-        return "minor"
+        return _severity("dust", billion_tons)
     
     def _get_casualty_severity(self, casualties):
-        if casualties > 5000000: return "catastrophic"
-        elif casualties > 1000000: return "severe"
-        elif casualties > 100000: return "moderate"
-        return "minor"
+        return _severity("casualty", casualties)
     
     def _get_infrastructure_severity(self, radius_km):
-        if radius_km > 1000: return "catastrophic"
-        elif radius_km > 500: return "severe"
-        elif radius_km > 100: return "moderate"
-        return "minor"
+        return _severity("infrastructure", radius_km)
     
     def _get_economic_severity(self, loss_billion):
-        if loss_billion > 5000: return "catastrophic"
-        elif loss_billion > 1000: return "severe"
-        elif loss_billion > 100: return "moderate"
-        return "minor"
+        return _severity("economic", loss_billion)
     
     def _get_refugee_severity(self, refugees):
-        if refugees > 20000000: return "catastrophic"
-        elif refugees > 5000000: return "severe"
-        elif refugees > 1000000: return "moderate"
-        return "minor"
+        return _severity("refugee", refugees)
 
 # Singleton instance
 physics_engine = EnhancedPhysicsEngine()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+# database.py reads these at import; the tests never connect
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "impact_simulator_test")
+
+from routers.enhanced_simulation import _compute_simulation_statistics
+
+
+def _mock_db(facets, last_simulation=None):
+    """A database whose simulations collection returns canned statistics"""
+    db = mock.MagicMock()
+    db.simulations.aggregate.return_value.to_list = mock.AsyncMock(return_value=[facets])
+    db.simulations.find_one = mock.AsyncMock(return_value=last_simulation)
+    return db
+
+
+EMPTY_FACETS = {
+    "total": [],
+    "nasa_enhanced": [],
+    "popular_asteroids": [],
+    "popular_locations": [],
+    "average_metrics": []
+}
+
+
+def test_statistics_use_a_single_facet_aggregation():
+    db = _mock_db(EMPTY_FACETS)
+
+    asyncio.run(_compute_simulation_statistics(db))
+
+    db.simulations.aggregate.assert_called_once()
+    pipeline = db.simulations.aggregate.call_args.args[0]
+    assert len(pipeline) == 1
+    assert set(pipeline[0]["$facet"]) == set(EMPTY_FACETS)
+
+    # The latest simulation is read through the created_at index instead
+    db.simulations.find_one.assert_awaited_once()
+    assert db.simulations.find_one.call_args.kwargs["sort"] == [("created_at", -1)]
+
+
+def test_statistics_from_facets():
+    created_at = datetime(2026, 1, 1)
+    db = _mock_db({
+        "total": [{"count": 8}],
+        "nasa_enhanced": [{"count": 6}],
+        "popular_asteroids": [{"_id": "3554375", "count": 6, "name": "Bennu"}],
+        "popular_locations": [{"_id": "New York", "count": 8}],
+        "average_metrics": [{"_id": None, "avg_energy_mt": 1200.0, "avg_crater_km": 12.5}]
+    }, {"created_at": created_at})
+
+    statistics = asyncio.run(_compute_simulation_statistics(db))
+
+    assert statistics == {
+        "total_simulations": 8,
+        "nasa_enhanced_count": 6,
+        "enhancement_rate": pytest.approx(75.0),
+        "popular_asteroids": [{"_id": "3554375", "count": 6, "name": "Bennu"}],
+        "popular_locations": [{"_id": "New York", "count": 8}],
+        "average_metrics": {"_id": None, "avg_energy_mt": 1200.0, "avg_crater_km": 12.5},
+        "last_simulation": created_at
+    }
+
+
+def test_statistics_for_empty_collection():
+    statistics = asyncio.run(_compute_simulation_statistics(_mock_db(EMPTY_FACETS)))
+
+    assert statistics == {
+        "total_simulations": 0,
+        "nasa_enhanced_count": 0,
+        "enhancement_rate": 0,
+        "popular_asteroids": [],
+        "popular_locations": [],
+        "average_metrics": {},
+        "last_simulation": None
+    }
@@ -0,0 +1,216 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import aiohttp
+import orjson
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from services.nasa_neo_service import NASANEOService
+
+
+class _FakeResponse:
+    """Just enough of aiohttp's response for _make_request"""
+
+    def __init__(self, status=200, body=None):
+        self.status = status
+        self.body = orjson.dumps(body if body is not None else {})
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(mock.MagicMock(), (), status=self.status)
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class _FakeSession:
+    """Replays one outcome per request: a response or an exception to raise"""
+
+    closed = False
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, params))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _service(outcomes):
+    """A service with a fake session whose retries don't sleep"""
+    service = NASANEOService()
+    service.api_key = "test-key"
+    service.session = _FakeSession(outcomes)
+    service.retry_attempts = []
+    service._retry_delay = lambda attempt: service.retry_attempts.append(attempt) or 0
+    return service
+
+
+def test_make_request_retries_transient_statuses():
+    service = _service([_FakeResponse(503), _FakeResponse(429), _FakeResponse(body={"id": "1"})])
+
+    assert asyncio.run(service._make_request("neo/1")) == {"id": "1"}
+    assert len(service.session.calls) == 3
+    assert service.retry_attempts == [0, 1]
+
+
+def test_make_request_retries_timeouts():
+    service = _service([asyncio.TimeoutError(), _FakeResponse(body={"id": "1"})])
+
+    assert asyncio.run(service._make_request("neo/1")) == {"id": "1"}
+    assert service.retry_attempts == [0]
+
+
+def test_make_request_gives_up_after_max_attempts():
+    service = _service([_FakeResponse(502)] * NASANEOService.MAX_ATTEMPTS)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service._make_request("neo/1"))
+    assert len(service.session.calls) == NASANEOService.MAX_ATTEMPTS
+    assert service.retry_attempts == list(range(NASANEOService.MAX_ATTEMPTS - 1))
+
+
+def test_make_request_does_not_retry_client_errors():
+    service = _service([_FakeResponse(404)])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service._make_request("neo/1"))
+    assert len(service.session.calls) == 1
+    assert service.retry_attempts == []
+
+
+def test_make_request_sends_api_key_and_params():
+    service = _service([_FakeResponse()])
+
+    asyncio.run(service._make_request("/feed", {"start_date": "2026-01-01"}))
+
+    url, params = service.session.calls[0]
+    assert url.endswith("/feed") and "//feed" not in url
+    assert params == {"api_key": "test-key", "start_date": "2026-01-01"}
+
+
+@pytest.mark.parametrize("attempt", range(NASANEOService.MAX_ATTEMPTS))
+def test_retry_delay_backs_off_with_jitter(attempt):
+    base = 0.5 * 2 ** attempt
+    for _ in range(50):
+        assert base <= NASANEOService._retry_delay(attempt) < base + 0.25
+
+
+def _feed_service(distances_by_window):
+    """A service whose feed returns NEOs at the given miss distances, one list per window"""
+    service = NASANEOService()
+    service.windows = []
+
+    async def get_neo_feed(start_date, end_date):
+        distances = distances_by_window[len(service.windows)]
+        service.windows.append((start_date, end_date))
+        return {"near_earth_objects": {start_date: [
+            {
+                "id": f"{start_date}-{i}",
+                "close_approach_data": [] if distance is None else [
+                    {"miss_distance": {"kilometers": str(distance + 1000)}},
+                    {"miss_distance": {"kilometers": str(distance)}}
+                ]
+            }
+            for i, distance in enumerate(distances)
+        ]}}
+
+    service.get_neo_feed = get_neo_feed
+    return service
+
+
+def test_close_approaches_split_into_weekly_windows():
+    service = _feed_service([[]] * 5)
+
+    asyncio.run(service.get_recent_close_approaches(days_ahead=30))
+
+    dates = [
+        (datetime.strptime(start, "%Y-%m-%d").date(), datetime.strptime(end, "%Y-%m-%d").date())
+        for start, end in sorted(service.windows)
+    ]
+    assert [(end - start).days + 1 for start, end in dates] == [7, 7, 7, 7, 3]
+    assert dates[-1][1] == dates[0][0] + timedelta(days=30)
+    for (_, previous_end), (next_start, _) in zip(dates, dates[1:]):
+        assert next_start == previous_end + timedelta(days=1)
+
+
+def test_close_approaches_keep_the_closest():
+    service = _feed_service([[500.0, None, 20.0], [10.0, 300.0], [40.0]])
+
+    closest, total = asyncio.run(service.get_recent_close_approaches(days_ahead=20, limit=3))
+
+    assert total == 6
+    assert [neo["_min_miss_km"] for neo in closest] == [10.0, 20.0, 40.0]
+    assert all("approach_date" in neo for neo in closest)
+
+
+def test_close_approaches_without_limit_sort_everything():
+    service = _feed_service([[500.0, None, 20.0], [10.0, 300.0], [40.0]])
+
+    closest, total = asyncio.run(service.get_recent_close_approaches(days_ahead=20))
+
+    assert total == 6
+    assert [neo["_min_miss_km"] for neo in closest] == [10.0, 20.0, 40.0, 300.0, 500.0, float("inf")]
+
+
+NEO = {
+    "id": "3554375",
+    "name": "101955 Bennu (1999 RQ36)",
+    "absolute_magnitude_h": 20.6,
+    "estimated_diameter": {"kilometers": {"estimated_diameter_min": 0.45, "estimated_diameter_max": 0.55}},
+    "is_potentially_hazardous_asteroid": True,
+    "orbital_data": {"semi_major_axis": "1.126", "eccentricity": "0.2037"},
+    "close_approach_data": [
+        {
+            "close_approach_date": "2030-01-01",
+            "relative_velocity": {"kilometers_per_second": "6.1"},
+            "miss_distance": {"kilometers": "1234567.8"},
+            "orbiting_body": "Earth"
+        }
+    ]
+}
+
+
+def test_parse_neo_includes_close_approaches_by_default():
+    asteroid = NASANEOService().parse_neo_to_asteroid(NEO)
+
+    assert len(asteroid.close_approaches) == 1
+    assert asteroid.close_approaches[0].distance_km == pytest.approx(1234567.8)
+
+
+def test_parse_neo_can_skip_close_approaches():
+    asteroid = NASANEOService().parse_neo_to_asteroid(NEO, include_approaches=False)
+
+    assert asteroid.close_approaches == []
+    assert asteroid.nasa_id == "3554375"
+    assert asteroid.estimated_diameter_km == pytest.approx(0.5)
+    assert asteroid.neo_type == "Apollo"
+
+
+def test_parse_neos_skips_malformed_entries():
+    malformed = {"name": "missing id"}
+    asteroids = NASANEOService().parse_neos([NEO, malformed, dict(NEO, id="2000433")])
+
+    assert [asteroid.nasa_id for asteroid in asteroids] == ["3554375", "2000433"]
+
+
+def test_parse_neos_passes_include_approaches_through():
+    service = NASANEOService()
+
+    assert all(a.close_approaches for a in service.parse_neos([NEO, NEO]))
+    assert not any(a.close_approaches for a in service.parse_neos([NEO, NEO], include_approaches=False))
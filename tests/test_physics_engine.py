@@ -0,0 +1,84 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from models.asteroid import Asteroid, DiameterEstimate, OrbitalElements
+from models.simulation import ImpactParameters, ImpactLocation
+from services.physics_engine import (
+    EnhancedPhysicsEngine, SEVERITY_LEVELS, SEVERITY_THRESHOLDS, _severity
+)
+
+
+def _scenarios(count=200, seed=42):
+    """Random asteroids and impact parameters covering the optional inputs"""
+    rnd = random.Random(seed)
+    scenarios = []
+    for i in range(count):
+        asteroid = Asteroid(
+            nasa_id=str(1000 + i),
+            name=f"Test {i}",
+            diameter=DiameterEstimate(),
+            estimated_diameter_km=rnd.choice([None, 10 ** rnd.uniform(-3, 1.5)]),
+            composition_type=rnd.choice(["rocky", "iron", "icy", "stony"]),
+            density_kg_m3=rnd.choice([None, rnd.uniform(900, 8000)]),
+            orbital_elements=rnd.choice([
+                None,
+                OrbitalElements(),
+                OrbitalElements(semi_major_axis_au=rnd.uniform(0.6, 3.0))
+            ])
+        )
+        parameters = ImpactParameters(
+            asteroid_nasa_id=asteroid.nasa_id,
+            impact_location=ImpactLocation(lat=rnd.uniform(-90, 90), lng=rnd.uniform(-180, 180), name="Test"),
+            impact_velocity_kms=rnd.choice([None, rnd.uniform(11, 72)]),
+            impact_angle_deg=rnd.uniform(15, 90),
+            target_density_kg_m3=rnd.uniform(1000, 3500)
+        )
+        scenarios.append((asteroid, parameters))
+    return scenarios
+
+
+def _assert_same(scalar, batch, path="results"):
+    if isinstance(scalar, dict):
+        assert scalar.keys() == batch.keys(), path
+        for key in scalar:
+            _assert_same(scalar[key], batch[key], f"{path}.{key}")
+    elif isinstance(scalar, float):
+        assert math.isclose(scalar, batch, rel_tol=1e-12, abs_tol=1e-12), path
+    else:
+        assert scalar == batch, path
+
+
+def test_batch_matches_scalar():
+    engine = EnhancedPhysicsEngine()
+    scenarios = _scenarios()
+
+    scalar = [engine.calculate_impact_scenario(a, p) for a, p in scenarios]
+    batch = engine.calculate_impact_scenario_batch([a for a, _ in scenarios], [p for _, p in scenarios])
+
+    assert len(batch) == len(scalar)
+    for one, many in zip(scalar, batch):
+        _assert_same(one.model_dump(mode="json"), many.model_dump(mode="json"))
+
+
+@pytest.mark.parametrize("metric", sorted(SEVERITY_THRESHOLDS))
+def test_severity_thresholds(metric):
+    bounds = SEVERITY_THRESHOLDS[metric]
+
+    assert _severity(metric, -math.inf) == "minor"
+    for level, bound in enumerate(bounds):
+        # A value equal to a bound stays in the lower level
+        assert _severity(metric, math.nextafter(bound, -math.inf)) == SEVERITY_LEVELS[level]
+        assert _severity(metric, bound) == SEVERITY_LEVELS[level]
+        assert _severity(metric, math.nextafter(bound, math.inf)) == SEVERITY_LEVELS[level + 1]
+    assert _severity(metric, math.inf) == "catastrophic"
+
+
+@pytest.mark.parametrize("metric", sorted(SEVERITY_THRESHOLDS))
+def test_severity_nan_is_minor(metric):
+    assert _severity(metric, math.nan) == "minor"